@@ -0,0 +1,287 @@
+"""Non-interactive benchmarks for the detection, OCR and typing hot paths.
+
+Runs against recorded frames (--frames DIR) or synthetic frames at several
+resolutions, without a live game, and reports latency percentiles,
+throughput and peak memory as JSON.
+
+    python benchmark.py --iterations 20 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import types
+from datetime import datetime
+
+import cv2
+import numpy as np
+import psutil
+
+from main import SteamGameMonitor, ReplayCapture, TimerReader, TYPING_PATTERNS, build_typing_plan, frame_buffers
+
+DEFAULT_RESOLUTIONS = ["1920x1080", "2560x1440", "3840x2160"]
+
+
+def make_synthetic_frame(width, height, with_chest=True, seed=0):
+    """Build a desktop-like frame with the game window, chest and taskbar icon pasted in"""
+    rng = np.random.default_rng(seed)
+    # Smooth texture so the matcher has realistic (not flat, not pure noise) background
+    frame = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (7, 7), 0)
+
+    # Game window: a lighter panel in the lower right area of the screen
+    window = types.SimpleNamespace(left=width * 3 // 5, top=height // 2, width=width // 4, height=height // 3)
+    frame[window.top:window.top + window.height, window.left:window.left + window.width] //= 2
+    frame[window.top:window.top + window.height, window.left:window.left + window.width] += 100
+
+    chest = cv2.imread("chest.png")
+    if with_chest and chest is not None:
+        chest_y = window.top + window.height // 2
+        chest_x = window.left + window.width // 2
+        frame[chest_y:chest_y + chest.shape[0], chest_x:chest_x + chest.shape[1]] = chest
+
+    icon = cv2.imread("App_icon_on_task_bar.png")
+    if icon is not None:
+        icon_y = height - icon.shape[0]
+        icon_x = width // 3
+        frame[icon_y:icon_y + icon.shape[0], icon_x:icon_x + icon.shape[1]] = icon
+
+    return frame, window
+
+
+def load_recorded_frames(frames_dir):
+    """Load recorded frames from a directory, grouped by resolution"""
+    capture = ReplayCapture(frames_dir)
+    groups = {}
+    for frame in capture.frames:
+        key = f"{frame.shape[1]}x{frame.shape[0]}"
+        groups.setdefault(key, []).append(frame)
+    return groups
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000) if samples else None
+
+
+def run_case(name, func, iterations, warmup=2, setup=None):
+    """Time func() over iterations (after warmup) and collect latency, throughput and memory"""
+    process = psutil.Process()
+    sink = io.StringIO()
+
+    # Warm caches (template decode, scale sweep, pooled buffers) before measuring
+    with contextlib.redirect_stdout(sink):
+        for _ in range(warmup):
+            if setup:
+                setup()
+            func()
+
+    samples = []
+    outcomes = []
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    rss_before = process.memory_info().rss
+    rss_peak = rss_before
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if setup:
+            setup()
+        sink.seek(0)
+        sink.truncate()
+        with contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            outcome = func()
+            samples.append(time.perf_counter() - start)
+        outcomes.append(outcome)
+        rss_peak = max(rss_peak, process.memory_info().rss)
+    total = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'case': name,
+        'iterations': iterations,
+        'p50_ms': percentile_ms(samples, 50),
+        'p95_ms': percentile_ms(samples, 95),
+        'mean_ms': float(np.mean(samples) * 1000),
+        'throughput_per_s': iterations / total if total > 0 else None,
+        'peak_traced_bytes': traced_peak,
+        'rss_growth_bytes': rss_peak - rss_before,
+        'successes': sum(1 for outcome in outcomes if outcome),
+    }
+
+
+def benchmark_resolution(label, frames, window, miss_frames, iterations):
+    """Benchmark every detection path on one resolution"""
+    results = []
+    monitor = SteamGameMonitor(capture_backend=ReplayCapture(frames), dry_run=True, detection_log_path=None)
+    monitor.bongo_cat_window = window
+
+    def reset_hot_spot():
+        monitor.chest_hot_spot = None
+
+    results.append(run_case("chest_hot_spot", monitor.take_screenshot_and_find_chest, iterations))
+    results.append(run_case("chest_window_roi", monitor.take_screenshot_and_find_chest, iterations,
+                            setup=reset_hot_spot))
+    results.append(run_case("taskbar_icon", monitor.find_bongo_cat_taskbar_icon, iterations))
+
+    # Chest and taskbar icon from one capture and one grayscale conversion, serially and on the thread pool
+    def batched(parallel):
+        frame = monitor.capture_frame()
+        matches = monitor.matcher.match_many(['chest', 'taskbar_icon'], frame, parallel=parallel)
+        return all(match and match['found'] for match in matches)
+
+    results.append(run_case("batched_detection", lambda: batched(False), iterations))
+    results.append(run_case("batched_detection_parallel", lambda: batched(True), iterations))
+
+    # Worst case: chest absent, every region searched plus one watcher sample
+    if miss_frames:
+        miss_monitor = SteamGameMonitor(capture_backend=ReplayCapture(miss_frames), dry_run=True,
+                                       detection_log_path=None)
+        miss_monitor.bongo_cat_window = window
+        results.append(run_case("chest_miss", lambda: miss_monitor.take_screenshot_and_find_chest(watch_timeout=0),
+                                iterations))
+
+    # Full read including capture; repeats one frame, so after the first read this mostly times the crop cache
+    # (timer_digits times the digit reader itself)
+    if ocr_available():
+        results.append(run_case("ocr_timer", monitor.read_timer_with_ocr, iterations))
+
+    for result in results:
+        result['resolution'] = label
+    results.append({'case': 'capture', 'resolution': label, **monitor.capture.stats()})
+    # Taken while this resolution's detection thread (and its buffers) is still alive
+    results.append({'case': 'frame_buffers', 'resolution': label, **frame_buffers.stats()})
+    monitor.shutdown()
+    if miss_frames:
+        miss_monitor.shutdown()
+    return results
+
+
+def make_timer_crop(seconds):
+    """Render a MM:SS timer crop like the game's (light, evenly spaced digits on a dark box)"""
+    crop = np.full((36, 110, 3), 40, np.uint8)
+    text = f"{seconds // 60:02d}:{seconds % 60:02d}"
+    for index, char in enumerate(text):
+        cv2.putText(crop, char, (8 + index * 19, 27), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (235, 235, 235), 2, cv2.LINE_AA)
+    return crop, text
+
+
+def benchmark_timer_digits(iterations):
+    """Benchmark the learned-digit timer reader on varied crops (no Tesseract, identical-crop cache bypassed)"""
+    reader = TimerReader(digits_path=None)
+    # Seed the templates the way Tesseract reads would, one crop per digit plus the colon
+    for seconds in range(0, 600, 61):
+        crop, text = make_timer_crop(seconds)
+        vectors, _ = reader.segment(reader.preprocess(crop))
+        reader.learn(vectors, text)
+
+    crops = [make_timer_crop(seconds) for seconds in range(1799, 0, -37)]
+    position = [0]
+
+    def read_next():
+        crop, text = crops[position[0] % len(crops)]
+        position[0] += 1
+        vectors, _ = reader.segment(reader.preprocess(crop))
+        return reader.read_digits(vectors) == text
+
+    result = run_case("timer_digits", read_next, iterations)
+    result['resolution'] = None
+    return [result]
+
+
+def pattern_keys(pattern, count, rng):
+    """Draw count keys from one typing pattern"""
+    keys = []
+    while len(keys) < count:
+        keys.extend(pattern(rng))
+    return keys
+
+
+def benchmark_typing(iterations):
+    """Benchmark the typing patterns, plan and loop (keys go to a recording backend, not the system)"""
+    monitor = SteamGameMonitor(capture_backend=ReplayCapture(np.zeros((1, 1, 3), np.uint8)), dry_run=True,
+                               detection_log_path=None)
+    monitor.keystrokes.hold_time = (0, 0)
+    batch = 1000
+    rng = np.random.default_rng(0)
+    results = [run_case(f"pattern_{name}_x1000", lambda pattern=pattern: pattern_keys(pattern, batch, rng), iterations)
+               for name, pattern in TYPING_PATTERNS.items()]
+    results.append(run_case("typing_plan_x1000", lambda: len(build_typing_plan(batch)), iterations))
+
+    # The typing loop itself, with every interval zero so only its own overhead is timed
+    items = [(key, 0.0, pattern) for key, _, pattern in monitor.typing.plan_items(build_typing_plan(batch, seed=0))]
+
+    def setup():
+        monitor.keystrokes.backend.events.clear()
+
+    results.append(run_case("typing_loop_x1000", lambda: monitor.typing.run(items), iterations, setup=setup))
+    for result in results:
+        result['resolution'] = None
+    return results
+
+
+def ocr_available():
+    """Check once whether Tesseract can be used for the OCR case"""
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Augo-Cat detection, OCR and typing hot paths")
+    parser.add_argument("--iterations", type=int, default=20, help="Measured iterations per case")
+    parser.add_argument("--resolutions", nargs="+", default=DEFAULT_RESOLUTIONS,
+                        help="Synthetic frame resolutions, e.g. 1920x1080")
+    parser.add_argument("--frames", help="Directory of recorded frames to use instead of synthetic ones")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    # Templates are loaded relative to the program folder
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    # Keep stdout clean for the JSON report; program output goes to stderr
+    results = []
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.frames:
+            for label, frames in load_recorded_frames(args.frames).items():
+                height, width = frames[0].shape[:2]
+                window = types.SimpleNamespace(left=0, top=0, width=width, height=height)
+                results.extend(benchmark_resolution(label, frames, window, None, args.iterations))
+        else:
+            for label in args.resolutions:
+                width, height = (int(value) for value in label.lower().split("x"))
+                print(f"Benchmarking {label}...")
+                frame, window = make_synthetic_frame(width, height)
+                miss_frame, _ = make_synthetic_frame(width, height, with_chest=False)
+                results.extend(benchmark_resolution(label, [frame], window, [miss_frame], args.iterations))
+        results.extend(benchmark_timer_digits(args.iterations))
+        results.extend(benchmark_typing(args.iterations))
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'frame_buffers': frame_buffers.stats(),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        print(f"Benchmark report written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import psutil
 import time
 import random
-import pyautogui
+try:
+    import pyautogui
+except Exception:  # No display (e.g. headless CI): only the replay capture backend works
+    pyautogui = None
 import cv2
 import numpy as np
 from PIL import Image
@@ -12,175 +15,2370 @@ import ctypes
 from ctypes import wintypes
 import pytesseract
 import re
+import glob
+import json
+import queue
+import weakref
+import asyncio
+import functools
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import mss  # Optional: much faster screen grabs than pyautogui/PIL
+except ImportError:
+    mss = None
+
+# Bongo Cat process names (based on actual detection)
+BONGO_CAT_PROCESS_NAMES = [
+    'bongocat.exe',
+    'bongo cat',
+    'bongocat',
+    'bongo-cat',
+    'bongo_cat',
+    'unitycrashhandler64.exe'  # Unity crash handler for Bongo Cat
+]
+
+# Words and characters typed in typing mode
+TYPING_WORDS = [
+    "hello", "world", "python", "programming", "computer", "keyboard", "mouse",
+    "screen", "monitor", "desktop", "window", "application", "software", "hardware",
+    "internet", "network", "database", "algorithm", "function", "variable", "class",
+    "object", "method", "parameter", "argument", "return", "import", "module",
+    "library", "framework", "development", "coding", "debugging", "testing",
+    "steam", "game", "gaming", "player", "level", "score", "achievement",
+    "bongo", "cat", "chest", "icon", "click", "screenshot", "image", "detection"
+]
+TYPING_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+# The same lists as ASCII codes, encoded once: every word is a slice of one array
+TYPING_WORD_KEYS = np.frombuffer("".join(TYPING_WORDS).encode(), dtype=np.uint8)
+TYPING_WORD_STARTS = np.cumsum([0] + [len(word) for word in TYPING_WORDS])
+TYPING_CHAR_KEYS = np.frombuffer(TYPING_CHARS.encode(), dtype=np.uint8)
+SPACE_KEY = ord(" ")
+
+# One row per key of a precomputed typing plan: ASCII code, start time from the plan start
+# and the index of the pattern that produced it
+TYPING_PLAN_DTYPE = np.dtype([('key', 'u1'), ('at', '<f8'), ('pattern', 'u1')])
+
+# Debug screenshot file names: <category>_<YYYYmmdd_HHMMSS>.png
+SCREENSHOT_NAME_PATTERN = re.compile(r'^(.+)_(\d{8}_\d{6})\.(?:png|jpg|jpeg)$')
+
+# Process name matchers, compiled once and shared by every process scan
+BONGO_CAT_PROCESS_PATTERN = re.compile('|'.join(re.escape(name) for name in BONGO_CAT_PROCESS_NAMES), re.IGNORECASE)
+GAME_PROCESS_PATTERN = re.compile(r'game|bongo|cat|steam|unity|unreal', re.IGNORECASE)
+STEAM_PATH_PATTERN = re.compile(r'steam', re.IGNORECASE)
+GAME_INDICATOR_PATTERN = re.compile(r'\.exe|game|launcher|client', re.IGNORECASE)
+STEAM_CLIENT_PATTERN = re.compile(r'steam\.exe|steamwebhelper\.exe|steamservice\.exe', re.IGNORECASE)
+
+# One fixed-size row per match attempt in the detection log (read back with np.memmap)
+DETECTION_LOG_DTYPE = np.dtype([
+    ('timestamp', '<f8'),      # Unix time of the attempt
+    ('template', 'S16'),
+    ('roi', '<i4', (4,)),      # Searched (x0, y0, x1, y1) in screen coordinates
+    ('score', '<f4'),          # Best confidence, NaN when nothing could be matched
+    ('location', '<i4', (2,)), # Top-left of the best match in screen coordinates
+    ('scale', '<f4'),
+    ('latency_ms', '<f4'),
+    ('outcome', 'S8'),         # found / miss / no_fit / empty
+])
+
+
+class ProcessTracker:
+    """Find matching processes with one full scan, then only check those PIDs are still alive"""
+    def __init__(self, name_pattern=BONGO_CAT_PROCESS_PATTERN):
+        self.name_pattern = name_pattern
+        self.tracked = []  # (psutil.Process, create_time, info dict) per tracked process
+        self.full_scans = 0
+
+    def scan(self):
+        """Walk the process list once and start tracking every matching process"""
+        self.full_scans += 1
+        self.tracked = []
+
+        # Match on process names first: resolving exe paths is slow and often denied
+        for proc in psutil.process_iter(['pid', 'name']):
+            try:
+                if proc.info['name'] and self.name_pattern.search(proc.info['name']):
+                    self.track(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        if self.tracked:
+            return
+
+        # Fall back to exe paths (e.g. a renamed binary inside the Bongo Cat install folder)
+        for proc in psutil.process_iter(['pid', 'name', 'exe']):
+            try:
+                if proc.info['exe'] and self.name_pattern.search(proc.info['exe']):
+                    self.track(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+
+    def track(self, proc):
+        """Remember a process by PID and create_time so a reused PID is not mistaken for it"""
+        try:
+            exe = proc.exe()
+        except (psutil.AccessDenied, psutil.ZombieProcess):
+            exe = None
+        self.tracked.append((proc, proc.create_time(), {
+            'name': proc.info['name'],
+            'exe': exe,
+            'pid': proc.pid
+        }))
+
+    def alive(self):
+        """Drop tracked processes that exited (or whose PID now belongs to another process)"""
+        still_alive = []
+        for proc, create_time, info in self.tracked:
+            try:
+                if proc.create_time() == create_time and proc.status() != psutil.STATUS_ZOMBIE:
+                    still_alive.append((proc, create_time, info))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        self.tracked = still_alive
+        return still_alive
+
+    def check(self, rescan=False):
+        """Check if a matching process is running; only rescans when every tracked PID is gone (or rescan is set)"""
+        if not self.alive() or rescan:
+            self.scan()
+        processes = [info for _, _, info in self.tracked]
+        return len(processes) > 0, processes
+
+
+class FrameBufferPool:
+    """Preallocated byte buffers, one per purpose, reused across detection cycles and capture sizes"""
+    def __init__(self):
+        # Each thread gets its own buffers, so concurrent detections never share an array. Detection itself
+        # runs on the monitor's single detection thread (see on_detection_thread), so full-frame buffers
+        # exist once; the matcher's worker pools only hold their own (ROI or tile sized) result buffers
+        self.local = threading.local()
+        # Every live thread's buffers, so stats() can report the whole pool from any thread
+        self.by_thread = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+        self.allocations = 0
+        self.reuses = 0
+
+    def get(self, purpose, shape, dtype=np.uint8):
+        """Get an array of shape/dtype; its contents are overwritten by the next get() of the same purpose on this thread"""
+        buffers = getattr(self.local, 'buffers', None)
+        if buffers is None:
+            buffers = self.local.buffers = {}
+            with self.lock:
+                self.by_thread[threading.current_thread()] = buffers
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize
+        buffer = buffers.get(purpose)
+        if buffer is None or buffer.nbytes < size:
+            # Grow to the largest size seen so far; smaller requests reuse the front of it
+            buffer = np.empty(size, dtype=np.uint8)
+            buffers[purpose] = buffer
+            self.allocations += 1
+        else:
+            self.reuses += 1
+        return buffer[:size].view(dtype).reshape(shape)
+
+    def stats(self):
+        """Get allocation/reuse counters and the buffers held by all live threads"""
+        with self.lock:
+            per_thread = [list(buffers.values()) for buffers in self.by_thread.values()]
+        return {
+            'allocations': self.allocations,
+            'reuses': self.reuses,
+            'threads': len(per_thread),
+            'buffers': sum(len(buffers) for buffers in per_thread),
+            'bytes': sum(buffer.nbytes for buffers in per_thread for buffer in buffers),
+        }
+
+
+# Shared by capture backends and the template matcher
+frame_buffers = FrameBufferPool()
+
+
+def on_detection_thread(method):
+    """Run a SteamGameMonitor (or helper with a .monitor) method on the monitor's detection thread"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        monitor = getattr(self, 'monitor', self)
+        return monitor.run_detection(method, self, *args, **kwargs)
+    return wrapper
+
+
+class CaptureBackend:
+    """Base screen capture backend: capture(region) returns a BGR or BGRA NumPy frame and times every grab"""
+    name = 'base'
+
+    def __init__(self):
+        self.grab_count = 0
+        self.grab_time = 0.0
+        self.last_grab_time = 0.0
+
+    def capture(self, region=None):
+        """Capture the screen (or region=(x, y, width, height)) and record how long it took"""
+        start = time.perf_counter()
+        frame = self.grab(region)
+        self.last_grab_time = time.perf_counter() - start
+        self.grab_time += self.last_grab_time
+        self.grab_count += 1
+        return frame
+
+    def grab(self, region):
+        raise NotImplementedError
+
+    def capture_desktop(self, primary=None):
+        """Capture every monitor as one frame; returns (frame, screen position of its top-left pixel)
+
+        This backend only sees the primary monitor, so that is the desktop (primary is reused when given).
+        """
+        return (self.capture() if primary is None else primary), (0, 0)
+
+    def screen_size(self):
+        raise NotImplementedError
+
+    def stats(self):
+        """Get capture latency statistics for this backend"""
+        return {
+            'backend': self.name,
+            'grabs': self.grab_count,
+            'average_ms': self.grab_time / self.grab_count * 1000 if self.grab_count else 0.0,
+            'last_ms': self.last_grab_time * 1000,
+        }
+
+    def close(self):
+        pass
+
+
+class PyAutoGUICapture(CaptureBackend):
+    """Capture through pyautogui/PIL (works everywhere pyautogui does, but slow)"""
+    name = 'pyautogui'
+
+    def grab(self, region):
+        screenshot = pyautogui.screenshot(region=region)
+        # Swap channels straight into a pooled buffer for this capture size. Region grabs (timer, counter)
+        # get their own buffer, so they never overwrite a full frame that is still being searched
+        rgb = np.asarray(screenshot)
+        frame = frame_buffers.get('capture' if region is None else 'capture_region', rgb.shape)
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=frame)
+
+    def screen_size(self):
+        return tuple(pyautogui.size())
+
+
+class MSSCapture(CaptureBackend):
+    """Capture through mss (native BitBlt/XShm grabs), returned as a zero-copy BGRA view"""
+    name = 'mss'
+
+    def __init__(self):
+        super().__init__()
+        # mss instances are not thread-safe, so each capturing thread gets its own
+        self.local = threading.local()
+
+    def grabber(self):
+        if not hasattr(self.local, 'sct'):
+            self.local.sct = mss.mss()
+        return self.local.sct
+
+    def grab(self, region):
+        sct = self.grabber()
+        if region is None:
+            # Primary monitor, matching pyautogui's coordinate space
+            area = sct.monitors[1]
+        else:
+            x, y, width, height = region
+            area = {'left': int(x), 'top': int(y), 'width': int(width), 'height': int(height)}
+        shot = sct.grab(area)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def capture_desktop(self, primary=None):
+        """Capture the whole virtual desktop (every monitor); its left/top may be negative"""
+        area = self.grabber().monitors[0]
+        frame = self.capture((area['left'], area['top'], area['width'], area['height']))
+        return frame, (area['left'], area['top'])
+
+    def screen_size(self):
+        monitor = self.grabber().monitors[1]
+        return monitor['width'], monitor['height']
+
+    def close(self):
+        if hasattr(self.local, 'sct'):
+            self.local.sct.close()
+            del self.local.sct
+
+
+class ReplayCapture(CaptureBackend):
+    """Serve recorded frames from a directory, a single array or a list of arrays (for headless runs and benchmarks)"""
+    name = 'replay'
+
+    def __init__(self, source, loop=True):
+        super().__init__()
+        if isinstance(source, np.ndarray):
+            self.frames = [source]
+        elif isinstance(source, str):
+            paths = sorted(path for path in glob.glob(os.path.join(source, '*'))
+                           if path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')))
+            self.frames = [frame for frame in (cv2.imread(path) for path in paths) if frame is not None]
+        else:
+            self.frames = list(source)
+        if not self.frames:
+            raise ValueError(f"No frames to replay from {source!r}")
+        self.loop = loop
+        self.index = 0
+
+    def grab(self, region):
+        frame = self.frames[self.index]
+        if self.index + 1 < len(self.frames):
+            self.index += 1
+        elif self.loop:
+            self.index = 0
+        if region is None:
+            return frame
+        x, y, width, height = region
+        return frame[y:y + height, x:x + width]
+
+    def screen_size(self):
+        height, width = self.frames[0].shape[:2]
+        return width, height
+
+
+def create_capture_backend(name='auto'):
+    """Create a capture backend by name: 'mss', 'pyautogui' or 'auto' (mss when installed)"""
+    if name == 'mss' or (name == 'auto' and mss is not None):
+        return MSSCapture()
+    if name in ('pyautogui', 'auto'):
+        return PyAutoGUICapture()
+    raise ValueError(f"Unknown capture backend: {name}")
+
+
+class CachedTemplate:
+    """A template image decoded once, with its grayscale form and resized copies"""
+    def __init__(self, name, path, mtime, image):
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self.image = image
+        self.gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        self.height, self.width = self.gray.shape
+        self.scaled = {1.0: self.gray}
+
+    def at_scale(self, scale):
+        """Get the grayscale template resized by scale (cached per scale)"""
+        scale = round(scale, 3)
+        if scale not in self.scaled:
+            width = max(1, int(round(self.width * scale)))
+            height = max(1, int(round(self.height * scale)))
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            self.scaled[scale] = cv2.resize(self.gray, (width, height), interpolation=interpolation)
+        return self.scaled[scale]
+
+
+class TemplateCache:
+    """Load each template image once and reload it only when the file changes on disk"""
+    def __init__(self, template_paths):
+        self.template_paths = dict(template_paths)
+        self.templates = {}
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        """Get a cached template by name, reloading it if the file's mtime changed"""
+        path = self.template_paths[name]
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            print(f"❌ Template image not found at {path}")
+            return None
+
+        with self.lock:
+            cached = self.templates.get(name)
+            if cached is not None and cached.mtime == mtime:
+                return cached
+
+            image = cv2.imread(path)
+            if image is None:
+                print(f"❌ Failed to load template image {path}")
+                return None
+
+            if cached is not None:
+                print(f"🔄 Template {path} changed on disk, reloading")
+            cached = CachedTemplate(name, path, mtime, image)
+            self.templates[name] = cached
+            return cached
+
+
+def frame_to_gray(frame, dst=None):
+    """Convert a captured BGR/BGRA frame to grayscale for template matching (into dst when given)"""
+    if frame.ndim == 2:
+        return frame
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=dst)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=dst)
+
+
+def match_template_into(image, template, purpose):
+    """Run TM_CCOEFF_NORMED into a pooled result matrix instead of allocating a new one"""
+    result_shape = (image.shape[0] - template.shape[0] + 1, image.shape[1] - template.shape[1] + 1)
+    result = frame_buffers.get(purpose, result_shape, np.float32)
+    return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, result=result)
+
+
+def get_display_dpi(x=0, y=0):
+    """Get (monitor handle, DPI) for the monitor containing screen point (x, y); DPI 96 = 100% scaling"""
+    try:
+        monitor = ctypes.windll.user32.MonitorFromPoint(wintypes.POINT(int(x), int(y)), 2)  # MONITOR_DEFAULTTONEAREST
+        dpi_x, dpi_y = ctypes.c_uint(), ctypes.c_uint()
+        if ctypes.windll.shcore.GetDpiForMonitor(monitor, 0, ctypes.byref(dpi_x), ctypes.byref(dpi_y)) == 0:
+            return monitor, dpi_x.value
+    except Exception:
+        pass
+    try:
+        return None, int(ctypes.windll.user32.GetDpiForSystem())
+    except Exception:
+        return None, 96
+
+
+def chest_search_regions(frame_width, frame_height, template, hot_spot=None, hot_spot_margin=40,
+                         window=None, window_margin=100, full_screen=True):
+    """Get chest search regions [(name, (x0, y0, x1, y1))], most likely first: hot spot, game window, full screen"""
+    regions = []
+
+    def add_region(name, left, top, right, bottom):
+        # Clamp to the frame and skip regions too small to contain the template
+        left, top = max(0, int(left)), max(0, int(top))
+        right, bottom = min(frame_width, int(right)), min(frame_height, int(bottom))
+        if right - left >= template.width and bottom - top >= template.height:
+            regions.append((name, (left, top, right, bottom)))
+
+    # Last successful chest location
+    if hot_spot:
+        x, y, w, h = hot_spot
+        add_region("Hot spot", x - hot_spot_margin, y - hot_spot_margin,
+                   x + w + hot_spot_margin, y + h + hot_spot_margin)
+
+    # Bongo Cat window rectangle plus a margin
+    if window:
+        add_region("Game window", window.left - window_margin, window.top - window_margin,
+                   window.left + window.width + window_margin, window.top + window.height + window_margin)
+
+    # Full screen fallback
+    if full_screen:
+        add_region("Full screen", 0, 0, frame_width, frame_height)
+    return regions
+
+
+def timer_region(window):
+    """Get the (x, y, width, height) screen area of a window's timer (adjust these fractions to your layout)"""
+    x, y, width, height = window.left, window.top, window.width, window.height
+    return x + width // 6, y + height // 3, width // 3 - width // 6, height // 2 - height // 3
+
+
+def timer_click_point(window):
+    """Get the screen point of a window's typing counter box; each click switches it between counter and timer"""
+    return window.left + window.width // 4, window.top + window.height // 2
+
+
+def counter_region(window):
+    """Get the (x, y, width, height) screen area of a window's typing counter
+
+    It is the timer_region box: it shows the counter until click_timer_area switches it to the timer.
+    """
+    return timer_region(window)
+
+
+def window_pid(window):
+    """Get the ID of the process that owns a pygetwindow window, or None where that is unknown"""
+    hwnd = getattr(window, '_hWnd', None)
+    if hwnd is None or not hasattr(ctypes, 'windll'):
+        return None
+    pid = wintypes.DWORD()
+    ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value or None
+
+
+class SearchImage:
+    """A grayscale search area and its half-resolution pyramid, built once and shared by every scale and template"""
+    def __init__(self, gray, pooled=True):
+        self.gray = gray
+        self.levels = [gray]
+        # Pooled levels live in the building thread's buffers, which only one search may use at a time
+        self.pooled = pooled
+        self.lock = threading.Lock()  # Templates matched in parallel may ask for a level at the same time
+
+    def level(self, n):
+        """Get the search area halved n times"""
+        with self.lock:
+            while len(self.levels) <= n:
+                previous = self.levels[-1]
+                dst = None
+                if self.pooled:
+                    shape = ((previous.shape[0] + 1) // 2, (previous.shape[1] + 1) // 2)
+                    dst = frame_buffers.get(f'pyramid_{len(self.levels) - 1}', shape)
+                self.levels.append(cv2.pyrDown(previous, dst=dst))
+            return self.levels[n]
+
+
+class TemplateMatcher:
+    """Coarse-to-fine, multi-scale template matcher that remembers the winning scale per display"""
+    def __init__(self, templates, thresholds=None):
+        self.templates = templates
+        self.thresholds = dict(thresholds or {})
+        self.default_threshold = 0.7
+        self.min_pyramid_template_size = 12  # Smallest template side allowed on the coarse level
+        self.max_pyramid_levels = 3
+        self.coarse_candidates = 3  # Coarse peaks refined at full resolution
+        self.min_coarse_confidence = 0.3  # Coarse peaks below this are not worth refining
+        # Template scales tried when the display scale is unknown (covers 50%-200% Windows scaling)
+        self.scales = [0.5, 0.6, 0.67, 0.75, 0.8, 0.9, 1.0, 1.1, 1.25, 1.33, 1.5, 1.75, 2.0]
+        self.scale_cache = {}  # (template, monitor, dpi) -> winning scale
+        self.scale_misses = {}  # Consecutive misses at the cached scale, per display key
+        self.max_cached_scale_misses = 5
+        self.log = None  # Optional DetectionLog that records every attempt
+        self.workers = max(1, min(4, os.cpu_count() or 1))  # Threads for parallel match_many
+        self.pool = None
+        # Large searches (e.g. a triple-monitor desktop) are split into overlapping tiles matched concurrently
+        self.tile_workers = os.cpu_count() or 1  # 1 disables tiling
+        self.tile_size = 1024  # Tile side, in result pixels
+        self.tile_pool = None
+        # Pools are created on first use, possibly from several matching threads at once
+        self.pool_lock = threading.Lock()
+
+    def pyramid_levels(self, template_width, template_height, search_width, search_height):
+        """Get how many times the search can be halved while the template stays recognisable"""
+        levels = 0
+        template_side = min(template_width, template_height)
+        while levels < self.max_pyramid_levels:
+            if template_side // 2 < self.min_pyramid_template_size:
+                break
+            # Not worth a pyramid when the search area is only a few templates wide
+            if search_width // 2 < template_width or search_height // 2 < template_height:
+                break
+            template_side //= 2
+            search_width //= 2
+            search_height //= 2
+            levels += 1
+        return levels
+
+    def candidate_scales(self, cached_scale):
+        """Get the cached scale and its neighbours from the scale list"""
+        if cached_scale not in self.scales:
+            return [cached_scale]
+        index = self.scales.index(cached_scale)
+        return self.scales[max(0, index - 1):index + 2]
+
+    def match(self, template_name, frame, roi=None, threshold=None, offset=(0, 0)):
+        """Find a template in a frame (optionally inside roi=(x0, y0, x1, y1)); returns a match dict or None"""
+        # offset is the screen position of frame[0, 0] for frames captured from a region,
+        # so returned coordinates are always screen coordinates
+        if self.templates.get(template_name) is None:
+            return None
+        start = time.perf_counter()
+        x0, y0, x1, y1 = self.clamp_roi(roi, frame)
+        if x1 - x0 < 1 or y1 - y0 < 1:
+            self.log_attempt(template_name, (offset[0] + x0, offset[1] + y0, offset[0] + x1, offset[1] + y1),
+                             None, start, 'empty')
+            return None
+
+        # Slicing is a view, so only the searched area is ever converted (once for all scales)
+        search = SearchImage(frame_to_gray(frame[y0:y1, x0:x1], dst=frame_buffers.get('gray', (y1 - y0, x1 - x0))))
+        return self.match_search(template_name, search, (x0, y0, x1, y1), threshold, roi is None, offset, start)
+
+    def match_many(self, requests, frame, offset=(0, 0), parallel=False):
+        """Match several templates against one frame in one pass; returns a match (or None) per request
+
+        requests are template names or (template name, roi) pairs. Each distinct ROI is converted to
+        grayscale once (only that slice of the frame), and requests sharing it also share its pyramid. With parallel=True
+        templates run on a thread pool (OpenCV releases the GIL while matching).
+        Single-game mode does not use it: the taskbar icon is found when a cycle starts and the
+        chest only appears when it ends, so those two searches never have a frame in common.
+        """
+        groups = {}  # Clamped ROI -> request indices
+        for index, request in enumerate(requests):
+            name, roi = (request, None) if isinstance(request, str) else request
+            groups.setdefault(self.clamp_roi(roi, frame), []).append((index, name, roi is None))
+
+        def run(job):
+            (x0, y0, x1, y1), search, (index, name, full_frame) = job
+            if self.templates.get(name) is None:
+                return index, None
+            return index, self.match_search(name, search, (x0, y0, x1, y1), None, full_frame, offset,
+                                            time.perf_counter())
+
+        # Every (ROI, template) pair is independent; searches shared across threads get their own pyramid
+        jobs = []
+        for group, ((x0, y0, x1, y1), members) in enumerate(groups.items()):
+            if x1 - x0 < 1 or y1 - y0 < 1:
+                continue
+            # Small ROIs (hot spots, windows) only convert their own slice; each group keeps its own buffer
+            gray = frame_to_gray(frame[y0:y1, x0:x1], dst=frame_buffers.get(f'gray_{group}', (y1 - y0, x1 - x0)))
+            search = SearchImage(gray, pooled=not parallel)
+            jobs.extend(((x0, y0, x1, y1), search, member) for member in members)
+
+        results = [None] * len(requests)
+        if parallel and len(jobs) > 1:
+            outcomes = self.thread_pool().map(run, jobs)
+        else:
+            outcomes = map(run, jobs)
+        for index, match in outcomes:
+            results[index] = match
+        return results
+
+    def thread_pool(self):
+        """Get the worker pool used for parallel matching (created on first use)"""
+        with self.pool_lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="matcher")
+            return self.pool
+
+    def tile_thread_pool(self):
+        """Get the worker pool used for tiled matching (created on first use)"""
+        with self.pool_lock:
+            if self.tile_pool is None:
+                self.tile_pool = ThreadPoolExecutor(max_workers=self.tile_workers, thread_name_prefix="matcher-tile")
+            return self.tile_pool
+
+    def close(self):
+        """Stop the worker pools"""
+        with self.pool_lock:
+            for pool in (self.pool, self.tile_pool):
+                if pool is not None:
+                    pool.shutdown(wait=False)
+            self.pool = None
+            self.tile_pool = None
+
+    def match_into(self, image, template, purpose):
+        """Run TM_CCOEFF_NORMED into a pooled result, tiled across the worker pool when the search is large"""
+        result_height = image.shape[0] - template.shape[0] + 1
+        result_width = image.shape[1] - template.shape[1] + 1
+        if self.tile_workers < 2 or result_height * result_width < 2 * self.tile_size * self.tile_size:
+            return match_template_into(image, template, purpose)
+
+        # Tiles partition the result; each reads its result area plus the template size of search
+        # image (the overlap), so the merged result equals one full-size matchTemplate
+        result = frame_buffers.get(purpose, (result_height, result_width), np.float32)
+        template_height, template_width = template.shape[:2]
+
+        def match_tile(tile):
+            top, left, bottom, right = tile
+            patch = image[top:bottom + template_height - 1, left:right + template_width - 1]
+            result[top:bottom, left:right] = match_template_into(patch, template, 'tile_result')
+
+        tiles = [(top, left, min(top + self.tile_size, result_height), min(left + self.tile_size, result_width))
+                 for top in range(0, result_height, self.tile_size)
+                 for left in range(0, result_width, self.tile_size)]
+        list(self.tile_thread_pool().map(match_tile, tiles))
+        return result
+
+    @staticmethod
+    def clamp_roi(roi, frame):
+        """Clamp roi=(x0, y0, x1, y1) (or the whole frame when None) to the frame"""
+        frame_height, frame_width = frame.shape[:2]
+        x0, y0, x1, y1 = roi if roi else (0, 0, frame_width, frame_height)
+        return max(0, x0), max(0, y0), min(frame_width, x1), min(frame_height, y1)
+
+    def match_search(self, template_name, search, roi, threshold, full_frame, offset, start):
+        """Match one template against a prepared SearchImage covering roi of the frame"""
+        template = self.templates.get(template_name)
+        if threshold is None:
+            threshold = self.thresholds.get(template_name, self.default_threshold)
+        x0, y0, x1, y1 = roi
+        screen_roi = (offset[0] + x0, offset[1] + y0, offset[0] + x1, offset[1] + y1)
+
+        # Sweep every scale once per display, afterwards only the winning scale and its neighbours
+        monitor, dpi = get_display_dpi(offset[0] + (x0 + x1) // 2, offset[1] + (y0 + y1) // 2)
+        display_key = (template_name, monitor, dpi)
+        cached_scale = self.scale_cache.get(display_key)
+        scales = self.candidate_scales(cached_scale) if cached_scale else self.scales
+        best = None
+        for scale in scales:
+            scaled = self.match_at_scale(template, scale, search)
+            if scaled and (best is None or scaled[0] > best[0]):
+                best = scaled
+
+        if best is None:
+            self.log_attempt(template_name, screen_roi, None, start, 'no_fit')
+            return None
+        confidence, loc, width, height, scale = best
+        if confidence >= threshold:
+            self.scale_misses.pop(display_key, None)
+            if cached_scale != scale:
+                print(f"📐 Using template scale {scale:.2f} for {template_name} @ {dpi} DPI")
+                self.scale_cache[display_key] = scale
+        elif cached_scale and full_frame and offset == (0, 0):
+            # Too many full-screen misses at the cached scale: forget it so the next search sweeps again
+            self.scale_misses[display_key] = self.scale_misses.get(display_key, 0) + 1
+            if self.scale_misses[display_key] >= self.max_cached_scale_misses:
+                print(f"📐 Template scale {cached_scale:.2f} for {template_name} keeps missing, re-sweeping next time")
+                self.scale_cache.pop(display_key, None)
+                self.scale_misses.pop(display_key, None)
+
+        top_left = (offset[0] + x0 + loc[0], offset[1] + y0 + loc[1])
+        match = {
+            'template': template_name,
+            'found': confidence >= threshold,
+            'confidence': confidence,
+            'threshold': threshold,
+            'top_left': top_left,
+            'bottom_right': (top_left[0] + width, top_left[1] + height),
+            'center': (top_left[0] + width // 2, top_left[1] + height // 2),
+            'width': width,
+            'height': height,
+            'scale': scale,
+            'roi': screen_roi,
+        }
+        self.log_attempt(template_name, screen_roi, match, start, 'found' if match['found'] else 'miss')
+        return match
+
+    def log_attempt(self, template_name, roi, match, start, outcome):
+        """Append one row for this match attempt to the detection log, if there is one"""
+        if self.log is None:
+            return
+        latency_ms = (time.perf_counter() - start) * 1000
+        if match is None:
+            self.log.record(template_name, roi, float('nan'), (-1, -1), float('nan'), latency_ms, outcome)
+        else:
+            self.log.record(template_name, roi, match['confidence'], match['top_left'], match['scale'],
+                            latency_ms, outcome)
+
+    def match_at_scale(self, template, scale, search):
+        """Match one template scale; returns (confidence, loc, width, height, scale) or None if it does not fit"""
+        search_gray = search.gray
+        template_gray = template.at_scale(scale)
+        template_height, template_width = template_gray.shape
+        search_height, search_width = search_gray.shape
+        if search_width < template_width or search_height < template_height:
+            return None
+
+        levels = self.pyramid_levels(template_width, template_height, search_width, search_height)
+        if levels == 0:
+            result = self.match_into(search_gray, template_gray, 'result')
+            _, confidence, _, loc = cv2.minMaxLoc(result)
+        else:
+            confidence, loc = self.match_pyramid(template, scale, search, levels)
+        return confidence, loc, template_width, template_height, scale
+
+    def match_pyramid(self, template, scale, search, levels):
+        """Match on the downsampled level, then refine the best coarse peaks at full resolution"""
+        factor = 2 ** levels
+        search_gray = search.gray
+        coarse = search.level(levels)
+        coarse_template = template.at_scale(scale / factor)
+        result = self.match_into(coarse, coarse_template, 'coarse_result')
+
+        # Pick the strongest coarse peaks, blanking each one's neighbourhood before the next
+        candidates = []
+        suppress_w = max(1, coarse_template.shape[1] // 2)
+        suppress_h = max(1, coarse_template.shape[0] // 2)
+        for _ in range(self.coarse_candidates):
+            _, peak_val, _, peak_loc = cv2.minMaxLoc(result)
+            if peak_val < self.min_coarse_confidence and candidates:
+                break
+            candidates.append(peak_loc)
+            px, py = peak_loc
+            result[max(0, py - suppress_h):py + suppress_h + 1, max(0, px - suppress_w):px + suppress_w + 1] = -1.0
+
+        # Refine each candidate in a small full-resolution window around its upscaled position
+        template_gray = template.at_scale(scale)
+        template_height, template_width = template_gray.shape
+        search_height, search_width = search_gray.shape
+        margin = factor * 2
+        best_val, best_loc = -1.0, (0, 0)
+        for cx, cy in candidates:
+            left = max(0, cx * factor - margin)
+            top = max(0, cy * factor - margin)
+            right = min(search_width, cx * factor + template_width + margin)
+            bottom = min(search_height, cy * factor + template_height + margin)
+            if right - left < template_width or bottom - top < template_height:
+                continue
+            refined = match_template_into(search_gray[top:bottom, left:right], template_gray, 'refine_result')
+            _, val, _, loc = cv2.minMaxLoc(refined)
+            if val > best_val:
+                best_val, best_loc = val, (left + loc[0], top + loc[1])
+        return best_val, best_loc
+
+
+class DetectionLog:
+    """Append-only binary log with one DETECTION_LOG_DTYPE row per match attempt"""
+    def __init__(self, path, buffer_rows=64, flush_interval=60.0):
+        self.path = path
+        self.rows = np.zeros(buffer_rows, dtype=DETECTION_LOG_DTYPE)  # Rows not yet written
+        self.pending = 0
+        self.flush_interval = flush_interval  # Seconds a row may wait in memory (attempts can be rare)
+        self.last_flush = time.monotonic()
+        self.written = 0
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record(self, template, roi, score, location, scale, latency_ms, outcome):
+        """Buffer one attempt; rows are appended to the file in batches"""
+        with self.lock:
+            row = self.rows[self.pending]
+            row['timestamp'] = time.time()
+            row['template'] = template.encode()[:16]
+            row['roi'] = roi
+            row['score'] = score
+            row['location'] = location
+            row['scale'] = scale
+            row['latency_ms'] = latency_ms
+            row['outcome'] = outcome.encode()
+            self.pending += 1
+            if self.pending == len(self.rows) or time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush_locked()
+
+    def flush(self):
+        """Append the buffered rows to the log file"""
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        """Append the buffered rows (caller holds the lock)"""
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        try:
+            with open(self.path, "ab") as f:
+                f.write(self.rows[:self.pending].tobytes())
+            self.written += self.pending
+        except OSError as e:
+            print(f"⚠️ Could not write detection log: {e}")
+        self.pending = 0
+
+    def close(self):
+        """Write whatever is still buffered"""
+        self.flush()
+
+    @staticmethod
+    def read(path):
+        """Memory-map a detection log as a structured array (no rows are loaded until used)"""
+        rows = os.path.getsize(path) // DETECTION_LOG_DTYPE.itemsize if os.path.exists(path) else 0
+        if rows == 0:
+            return np.zeros(0, dtype=DETECTION_LOG_DTYPE)
+        # A partly written last row (e.g. after a crash) is left out
+        return np.memmap(path, dtype=DETECTION_LOG_DTYPE, mode='r', shape=(rows,))
+
+
+class TimerReader:
+    """Read the MM:SS game timer: cached result, learned digit templates, then Tesseract as a fallback"""
+    glyph_size = (12, 16)  # (width, height) every glyph is normalised to
+    classes = "0123456789:"  # Also the Tesseract whitelist
+    label = "timer"
+
+    def __init__(self, digits_path="./timer_digits.npz", upscale=3, min_digit_score=0.85):
+        self.digits_path = digits_path
+        self.upscale = upscale  # Tesseract reads small digits much better when they are enlarged
+        self.min_digit_score = min_digit_score  # Lowest glyph correlation trusted without Tesseract
+        self.tesseract_ok = None  # Checked once, on first use
+        self.sums = np.zeros((len(self.classes), self.glyph_size[0] * self.glyph_size[1]), np.float32)
+        self.counts = np.zeros(len(self.classes), np.int32)
+        self.templates = None  # (learned class indices, normalised template matrix)
+        self.last_binary = None
+        self.last_reading = None
+        self.last_text = None  # Raw text of the last read, also when it did not parse
+        self.reads = {'cache': 0, 'digits': 0, 'tesseract': 0, 'failed': 0}
+        self.load()
+
+    def tesseract_available(self):
+        """Check once whether Tesseract can be run"""
+        if self.tesseract_ok is None:
+            try:
+                pytesseract.get_tesseract_version()
+                self.tesseract_ok = True
+            except Exception as e:
+                print(f"Tesseract OCR not available: {e}")
+                self.tesseract_ok = False
+        return self.tesseract_ok
+
+    def load(self):
+        """Load digit templates learned in earlier runs"""
+        if not self.digits_path or not os.path.exists(self.digits_path):
+            return
+        try:
+            with np.load(self.digits_path) as data:
+                if data['sums'].shape == self.sums.shape:
+                    self.sums = data['sums'].astype(np.float32)
+                    self.counts = data['counts'].astype(np.int32)
+                    self.build_templates()
+        except Exception as e:
+            print(f"⚠️ Could not load {self.label} digit templates: {e}")
+
+    def save(self):
+        """Keep the learned digit templates for the next run"""
+        if not self.digits_path:
+            return
+        try:
+            np.savez(self.digits_path, sums=self.sums, counts=self.counts)
+        except OSError as e:
+            print(f"⚠️ Could not save {self.label} digit templates: {e}")
+
+    def preprocess(self, crop):
+        """Grayscale and binarise the timer crop; returns a 0/255 image with the text white"""
+        gray = frame_to_gray(crop)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        # The text is the minority class, whatever the theme colours are
+        if cv2.countNonZero(binary) > binary.size // 2:
+            binary = cv2.bitwise_not(binary)
+        return binary
+
+    def segment(self, binary):
+        """Split the binarised crop into glyphs at empty columns; returns (glyph vectors, left x of each)"""
+        columns = np.flatnonzero(binary.any(axis=0))
+        if columns.size == 0:
+            return None, []
+        # Start a new glyph wherever there is a gap between inked columns
+        breaks = np.flatnonzero(np.diff(columns) > 1)
+        starts = np.concatenate(([columns[0]], columns[breaks + 1]))
+        ends = np.concatenate((columns[breaks], [columns[-1]])) + 1
+
+        rows = np.flatnonzero(binary.any(axis=1))
+        top, bottom = rows[0], rows[-1] + 1
+        vectors = np.empty((len(starts), self.glyph_size[0] * self.glyph_size[1]), np.float32)
+        line_height = bottom - top
+        box_width = max(1, line_height * self.glyph_size[0] // self.glyph_size[1])
+        for index, (start, end) in enumerate(zip(starts, ends)):
+            # Centre each glyph in a box of the text line's height, so narrow glyphs ('1', ':') keep their shape
+            glyph = binary[top:bottom, start:end]
+            pad = max(0, box_width - (end - start))
+            glyph = cv2.copyMakeBorder(glyph, 0, 0, pad // 2, pad - pad // 2, cv2.BORDER_CONSTANT, value=0)
+            vectors[index] = cv2.resize(glyph, self.glyph_size, interpolation=cv2.INTER_AREA).reshape(-1)
+        return vectors, list(starts)
+
+    @staticmethod
+    def normalise(vectors):
+        """Zero-mean, unit-length rows so a dot product is a correlation"""
+        vectors = vectors - vectors.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-6)
+
+    def build_templates(self):
+        """Average the learned samples of every class into the template matrix"""
+        learned = np.flatnonzero(self.counts)
+        if learned.size == 0:
+            self.templates = None
+            return
+        means = self.sums[learned] / self.counts[learned, None]
+        self.templates = (learned, self.normalise(means))
+
+    def read_digits(self, vectors):
+        """Classify every glyph against the learned templates; returns the text or None if unsure"""
+        if self.templates is None or vectors is None:
+            return None
+        learned, matrix = self.templates
+        scores = self.normalise(vectors) @ matrix.T
+        best = scores.argmax(axis=1)
+        if scores[np.arange(len(best)), best].min() < self.min_digit_score:
+            return None
+        return "".join(self.classes[learned[index]] for index in best)
+
+    def learn(self, vectors, text):
+        """Add the glyphs of a Tesseract read to the templates when they line up one glyph per character"""
+        if vectors is None or len(vectors) != len(text):
+            return
+        for vector, char in zip(vectors, text):
+            index = self.classes.index(char)
+            self.sums[index] += vector
+            self.counts[index] += 1
+        self.build_templates()
+        self.save()
+
+    def read_tesseract(self, binary):
+        """Read the enlarged, dark-on-light crop with Tesseract"""
+        if not self.tesseract_available():
+            return None
+        enlarged = cv2.resize(binary, None, fx=self.upscale, fy=self.upscale, interpolation=cv2.INTER_NEAREST)
+        enlarged = cv2.copyMakeBorder(cv2.bitwise_not(enlarged), 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=255)
+        return pytesseract.image_to_string(enlarged, config=f'--psm 7 -c tessedit_char_whitelist={self.classes}').strip()
+
+    @staticmethod
+    def parse(text):
+        """Parse MM:SS into seconds, or None"""
+        timer_match = re.fullmatch(r'(\d{1,2}):(\d{2})', text or "")
+        if not timer_match:
+            return None
+        return int(timer_match.group(1)) * 60 + int(timer_match.group(2))
+
+    def read(self, crop):
+        """Read the crop; returns {'value', 'text', 'method'} or None (value is the parsed number)"""
+        binary = self.preprocess(crop)
+
+        # The timer only changes once a second, so an identical crop means an identical reading
+        if self.last_reading and self.last_binary is not None and np.array_equal(binary, self.last_binary):
+            self.reads['cache'] += 1
+            self.last_text = self.last_reading['text']
+            return dict(self.last_reading, method='cache')
+
+        vectors, _ = self.segment(binary)
+        text = self.read_digits(vectors)
+        method = 'digits'
+        if self.parse(text) is None:
+            text = self.read_tesseract(binary)
+            method = 'tesseract'
+            if self.parse(text) is not None:
+                self.learn(vectors, text)
+
+        self.last_text = text
+        value = self.parse(text)
+        if value is None:
+            self.reads['failed'] += 1
+            self.last_binary, self.last_reading = None, None
+            print(f"Could not parse {self.label} from OCR: '{text or ''}'")
+            return None
+        self.reads[method] += 1
+        self.last_binary = binary
+        self.last_reading = {'value': value, 'text': text, 'method': method}
+        return dict(self.last_reading)
+
+
+class CounterReader(TimerReader):
+    """Read the game's typing counter (a plain number, maybe with thousands separators) the same way as the timer"""
+    classes = "0123456789,.:"  # ':' is read so the timer, shown in the same box, can be told apart
+    label = "typing counter"
+
+    def __init__(self, digits_path="./counter_digits.npz", upscale=3, min_digit_score=0.85):
+        super().__init__(digits_path, upscale, min_digit_score)
+
+    @staticmethod
+    def parse(text):
+        """Parse the counter into an int, or None (also for the MM:SS timer)"""
+        if not re.fullmatch(r'\d[\d,.]*', text or ""):
+            return None
+        return int(re.sub(r'\D', '', text))
+
+
+class TimerTracker:
+    """Follow the game timer with cheap re-reads and fit it against the monotonic clock to predict expiry"""
+    def __init__(self, monitor, min_interval=2.0, max_interval=120.0, history=8):
+        self.monitor = monitor
+        self.min_interval = min_interval  # Closest re-reads, just before expiry (seconds)
+        self.max_interval = max_interval  # Furthest apart re-reads, early in the cycle (seconds)
+        self.samples = deque(maxlen=history)  # (monotonic time, game seconds remaining)
+        self.fallback_expiry = None  # Used until the timer has been read at least once
+        # Readings arrive on an executor thread while the event loop and the typing thread predict from them
+        self.lock = threading.RLock()
+        self.reads = 0
+        self.failed_reads = 0
+
+    def reset(self):
+        """Forget the previous cycle's readings"""
+        with self.lock:
+            self.samples.clear()
+            self.fallback_expiry = None
+        self.reads = 0
+        self.failed_reads = 0
+
+    def observe(self, game_seconds, at=None):
+        """Add one timer reading taken at monotonic time at"""
+        at = time.monotonic() if at is None else at
+        with self.lock:
+            # A reading well above the prediction means the game started a new cycle
+            if self.samples and game_seconds > self.remaining(at) + 5:
+                self.samples.clear()
+            self.samples.append((at, game_seconds))
+
+    def fit(self):
+        """Get (monotonic expiry time, game seconds per real second) from the readings"""
+        with self.lock:
+            samples = list(self.samples)
+            fallback_expiry = self.fallback_expiry
+        if not samples:
+            return fallback_expiry, 1.0
+        times, remaining = np.array(samples, dtype=np.float64).T
+        if len(samples) >= 3 and times[-1] - times[0] >= 10:
+            slope, intercept = np.polyfit(times - times[0], remaining, 1)
+            rate = -slope
+            # Only trust a fitted rate close to real time; OCR glitches should not bend the clock
+            if 0.8 <= rate <= 1.2:
+                return times[0] + intercept / rate, rate
+        # Readings are whole seconds, so average their individual predictions
+        return float(np.mean(times + remaining)), 1.0
+
+    def remaining(self, now=None):
+        """Get the predicted seconds until the game timer expires"""
+        now = time.monotonic() if now is None else now
+        expiry, _ = self.fit()
+        return None if expiry is None else expiry - now
+
+    def next_read_delay(self, remaining):
+        """Read rarely early in the cycle and more often as expiry approaches"""
+        return max(self.min_interval, min(self.max_interval, remaining / 4))
+
+    def read(self):
+        """Re-read the game timer and add it to the fit; returns the drift it corrected, in seconds"""
+        before = self.remaining()
+        seconds = self.monitor.read_timer_with_ocr()
+        self.reads += 1
+        if seconds is None:
+            self.failed_reads += 1
+            return None
+        self.observe(seconds)
+        after = self.remaining()
+        return None if before is None else after - before
+
+    def start(self, fallback_seconds):
+        """Begin a countdown; fallback_seconds is used until the timer has been read"""
+        with self.lock:
+            if not self.samples:
+                self.fallback_expiry = time.monotonic() + fallback_seconds
+
+
+class CycleOrchestrator:
+    """Run one countdown cycle as asyncio tasks; blocking OpenCV, OCR and input work goes to an executor"""
+    def __init__(self, monitor, workers=4):
+        self.monitor = monitor
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="augo-cat")
+        self.loop = None
+        self.task = None  # The running cycle, cancelled by cancel()
+
+    async def blocking(self, func, *args):
+        """Run a blocking call on the executor without stalling the other tasks"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def watch_process(self):
+        """Finish with 'game_stopped' as soon as Bongo Cat is no longer running"""
+        while True:
+            await asyncio.sleep(self.monitor.process_check_interval)
+            is_running, _ = await self.blocking(self.monitor.is_bongo_cat_running)
+            if not is_running:
+                print("\n❌ Bongo Cat stopped during the countdown.")
+                return 'game_stopped'
+
+    async def track_timer(self, expiry_changed):
+        """Re-read the game timer at adaptive intervals and announce every new prediction"""
+        tracker = self.monitor.timer_tracker
+        while True:
+            await asyncio.sleep(tracker.next_read_delay(tracker.remaining()))
+            drift = await self.blocking(tracker.read)
+            if drift is not None and abs(drift) >= 1:
+                print(f"\n⏱️ Timer resynced: {drift:+.1f}s")
+            expiry_changed.set()
+
+    async def wait_for_expiry(self, expiry_changed):
+        """Sleep until the predicted expiry, re-arming whenever a resync moves it"""
+        tracker = self.monitor.timer_tracker
+        while True:
+            remaining = tracker.remaining()
+            if remaining <= 0:
+                return 'expired'
+            expiry_changed.clear()
+            try:
+                await asyncio.wait_for(expiry_changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def verify_keystrokes(self):
+        """Compare the game's typing counter with the keys sent while typing runs"""
+        verifier = self.monitor.keystroke_verifier
+        await self.blocking(verifier.start)
+        while True:
+            await asyncio.sleep(verifier.interval)
+            await self.blocking(verifier.check)
+
+    async def show_progress(self, cycle_number):
+        """Refresh the countdown display"""
+        tracker = self.monitor.timer_tracker
+        while True:
+            remaining = max(0, int(round(tracker.remaining())))
+            print(f"\rCycle {cycle_number} - Time remaining: {remaining // 60:02d}:{remaining % 60:02d}", end="", flush=True)
+            await asyncio.sleep(self.monitor.progress_interval)
+
+    async def cycle(self, cycle_number, countdown_duration, target_chars=None):
+        """Count down (typing if target_chars is given) and open the chest; returns a result dict"""
+        monitor = self.monitor
+        tracker = monitor.timer_tracker
+        tracker.start(countdown_duration)
+        expiry_changed = asyncio.Event()
+        result = {'outcome': 'cancelled', 'chest_found': False}
+
+        typing = None
+        if target_chars:
+            monitor.stop_typing = False
+            typing = asyncio.ensure_future(self.blocking(monitor.type_random_words_with_target, target_chars))
+        background = [
+            asyncio.ensure_future(self.track_timer(expiry_changed)),
+            asyncio.ensure_future(self.show_progress(cycle_number)),
+        ]
+        verifying = bool(target_chars) and monitor.verify_keystrokes
+        if verifying:
+            background.append(asyncio.ensure_future(self.verify_keystrokes()))
+        finishers = [
+            asyncio.ensure_future(self.wait_for_expiry(expiry_changed)),
+            asyncio.ensure_future(self.watch_process()),
+        ]
+        try:
+            done, _ = await asyncio.wait(finishers, return_when=asyncio.FIRST_COMPLETED)
+            result['outcome'] = done.pop().result()
+        finally:
+            for task in background + finishers:
+                task.cancel()
+            # The typing loop checks this flag before and after every wait; stop() cuts the wait short
+            monitor.stop_typing = True
+            monitor.typing.stop()
+            if typing:
+                await asyncio.gather(typing, return_exceptions=True)
+
+        if tracker.reads:
+            print(f"\n⏱️ Timer re-read {tracker.reads} times ({tracker.failed_reads} failed)")
+        if verifying:
+            await self.blocking(monitor.keystroke_verifier.check)
+            acceptance = monitor.keystroke_verifier.acceptance()
+            stats = monitor.keystroke_verifier.stats()
+            if acceptance is not None:
+                print(f"⌨️ Game counted {stats['keys_counted']:,} of {stats['keys_sent']:,} checked keys ({acceptance:.0%})")
+            elif stats['failed_reads']:
+                print(f"⚠️ Typing counter could not be read this cycle ({stats['failed_reads']} failed reads); "
+                      f"keys were not checked. Adjust counter_region() to your layout")
+        if result['outcome'] == 'expired':
+            print(f"\n\nCycle {cycle_number} completed! Taking screenshot and opening chest...")
+            if target_chars:
+                monitor.cleanup_typing_area()
+            result['chest_found'] = bool(await self.blocking(monitor.take_screenshot_and_find_chest))
+        return result
+
+    async def run_cycle(self, cycle_number, countdown_duration, target_chars=None):
+        """Run cycle() as the cancellable task of this orchestrator"""
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        try:
+            return await self.cycle(cycle_number, countdown_duration, target_chars)
+        finally:
+            self.loop = None
+            self.task = None
+
+    def run(self, cycle_number, countdown_duration, target_chars=None):
+        """Run one cycle to completion from synchronous code (Ctrl+C still raises KeyboardInterrupt)"""
+        try:
+            return asyncio.run(self.run_cycle(cycle_number, countdown_duration, target_chars))
+        except asyncio.CancelledError:
+            return {'outcome': 'cancelled', 'chest_found': False}
+
+    def cancel(self):
+        """Cancel the running cycle from any thread"""
+        loop, task = self.loop, self.task
+        if loop and task:
+            loop.call_soon_threadsafe(task.cancel)
+
+    def close(self):
+        """Stop the executor threads"""
+        self.executor.shutdown(wait=False)
+
+
+class ChestWatcher:
+    """Sample only the chest region at a low frame rate and report the chest as soon as it appears"""
+    def __init__(self, monitor, fps=1.0, cpu_budget=0.05):
+        self.monitor = monitor
+        self.fps = fps  # Target samples per second
+        self.cpu_budget = cpu_budget  # Max share of one core spent sampling (0.05 = 5%)
+        self.samples = 0
+        self.busy_time = 0.0
+        self.elapsed = 0.0
+
+    def watch_region(self, template):
+        """Get the (x0, y0, x1, y1) region to sample: game window if known, else hot spot, else full screen"""
+        screen_width, screen_height = self.monitor.capture.screen_size()
+        regions = dict(self.monitor.get_chest_search_regions(screen_width, screen_height, template))
+        for name in ("Game window", "Hot spot", "Full screen"):
+            if name in regions:
+                return name, regions[name]
+        return "Full screen", (0, 0, screen_width, screen_height)
+
+    def watch(self, timeout, stop_event):
+        """Sample the chest region until the chest matches, timeout seconds pass or stop_event is set"""
+        template = self.monitor.templates.get('chest')
+        if template is None:
+            return None
+
+        region_name, (x0, y0, x1, y1) = self.watch_region(template)
+        print(f"👀 Watching {region_name.lower()} ({x0}, {y0})-({x1}, {y1}) at up to {self.fps:g} fps, "
+              f"CPU budget {self.cpu_budget:.0%}")
+
+        self.samples = 0
+        self.busy_time = 0.0
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = 1.0 / self.fps
+        match = None
+
+        while not stop_event.is_set():
+            sample_start = time.monotonic()
+            frame = self.monitor.capture_frame(region=(x0, y0, x1 - x0, y1 - y0))
+            sample = self.monitor.matcher.match('chest', frame, offset=(x0, y0))
+            cost = time.monotonic() - sample_start
+            self.samples += 1
+            self.busy_time += cost
+
+            if sample and sample['found']:
+                match = sample
+                break
+
+            # Never sample more often than the CPU budget allows for the measured cost
+            next_sample = sample_start + max(interval, cost / self.cpu_budget)
+            if next_sample >= deadline:
+                break
+
+            remaining = int(deadline - time.monotonic())
+            confidence = sample['confidence'] if sample else 0.0
+            print(f"\r👀 Watching: {remaining // 60:02d}:{remaining % 60:02d} remaining (last confidence {confidence:.3f})",
+                  end="", flush=True)
+
+            # Wait in short slices so Ctrl+C is still handled promptly on Windows
+            while not stop_event.is_set() and time.monotonic() < next_sample:
+                stop_event.wait(min(1.0, next_sample - time.monotonic()))
+
+        self.elapsed = time.monotonic() - start
+        print()
+        self.report()
+        return match
+
+    def report(self):
+        """Print how many samples were taken and how much CPU they cost"""
+        if not self.samples:
+            return
+        average_ms = self.busy_time / self.samples * 1000
+        cpu_share = self.busy_time / self.elapsed if self.elapsed > 0 else 0.0
+        print(f"📊 Chest watcher: {self.samples} samples, {average_ms:.1f} ms/sample, "
+              f"{cpu_share:.1%} of one core (budget {self.cpu_budget:.0%})")
+
+
+class ScreenshotIndex:
+    """JSON manifest of saved debug screenshots (category, timestamp, confidence, size) with per-category retention"""
+    def __init__(self, screenshot_dir, max_per_category=5, filename="index.json"):
+        self.screenshot_dir = screenshot_dir
+        self.max_per_category = max_per_category
+        self.path = os.path.join(screenshot_dir, filename)
+        self.categories = {}  # category -> deque of entries, oldest first
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load the manifest, or build it once from the folder if there is none yet"""
+        entries = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    entries = json.load(f).get('entries', [])
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Screenshot index unreadable, rebuilding it: {e}")
+
+        if entries is None:
+            entries = []
+            for filename in os.listdir(self.screenshot_dir):
+                match = SCREENSHOT_NAME_PATTERN.match(filename)
+                if match:
+                    entries.append({
+                        'file': filename,
+                        'category': match.group(1),
+                        'timestamp': match.group(2),
+                        'confidence': None,
+                        'bytes': os.path.getsize(os.path.join(self.screenshot_dir, filename)),
+                    })
+            self.dirty = True
+
+        # Timestamps sort chronologically
+        for entry in sorted(entries, key=lambda entry: entry['timestamp']):
+            for evicted in self.add(entry):
+                self.delete_file(evicted)
+        self.flush()
+
+    def add(self, entry):
+        """Record a saved screenshot; returns the entries that fell out of its category"""
+        with self.lock:
+            entries = self.categories.setdefault(entry['category'], deque())
+            # A same-second save overwrote the file, so replace its entry
+            for existing in [existing for existing in entries if existing['file'] == entry['file']]:
+                entries.remove(existing)
+            entries.append(entry)
+            evicted = []
+            while len(entries) > self.max_per_category:
+                evicted.append(entries.popleft())
+            self.dirty = True
+            return evicted
+
+    def delete_file(self, entry):
+        """Delete the image behind an evicted index entry"""
+        try:
+            os.remove(os.path.join(self.screenshot_dir, entry['file']))
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"⚠️ Could not delete {entry['file']}: {e}")
+            return False
+
+    def latest(self, category):
+        """Get the newest entry of a category, or None"""
+        with self.lock:
+            entries = self.categories.get(category)
+            return dict(entries[-1]) if entries else None
+
+    def entries(self, category=None):
+        """Get index entries (of one category, or all), oldest first"""
+        with self.lock:
+            groups = [self.categories.get(category, ())] if category else self.categories.values()
+            return sorted((dict(entry) for group in groups for entry in group), key=lambda entry: entry['timestamp'])
+
+    def flush(self):
+        """Write the manifest if it changed (atomically, via a temporary file)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            entries = [entry for group in self.categories.values() for entry in group]
+            self.dirty = False
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({'version': 1, 'entries': entries}, f, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not write screenshot index: {e}")
+
+
+class ScreenshotArchiver:
+    """Encode debug frames on a background thread and keep only the newest few per category"""
+    def __init__(self, screenshot_dir, max_per_category=5, queue_size=8):
+        self.screenshot_dir = screenshot_dir
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.index = ScreenshotIndex(screenshot_dir, max_per_category)
+        self.saved = 0
+        self.deleted = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, frame, category, timestamp, confidence=None, box=None, label=None):
+        """Queue a frame for saving without ever blocking the caller; returns the path or None if dropped"""
+        if self.queue.full():
+            self.dropped += 1
+            return None
+        filename = f"{category}_{timestamp}.png"
+        # The caller keeps using (and may reuse) its frame buffer, so queue a private copy
+        try:
+            self.queue.put_nowait((frame.copy(), category, timestamp, filename, confidence, box, label))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        return os.path.join(self.screenshot_dir, filename)
+
+    def run(self):
+        """Worker loop: take a batch of queued frames, encode them, then write the index once"""
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item is None:
+                    self.index.flush()
+                    return
+                self.encode(*item)
+            self.index.flush()
+
+    def encode(self, frame, category, timestamp, filename, confidence, box, label):
+        """Annotate and write one frame, index it, and delete whatever its category no longer keeps"""
+        screenshot_path = os.path.join(self.screenshot_dir, filename)
+        try:
+            if frame.ndim == 3 and frame.shape[2] == 4:
+                # Native grabs carry an unused (often zero) alpha channel
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+            if box is not None:
+                top_left, bottom_right = box
+                cv2.rectangle(frame, top_left, bottom_right, (0, 255, 0), 2)
+                if label:
+                    cv2.putText(frame, label,
+                               (top_left[0], top_left[1] - 10),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            ok, encoded = cv2.imencode(".png", frame)
+            if not ok:
+                raise ValueError("PNG encoding failed")
+            with open(screenshot_path, "wb") as f:
+                f.write(encoded.tobytes())
+            self.saved += 1
+        except Exception as e:
+            print(f"⚠️ Could not save debug screenshot {screenshot_path}: {e}")
+            return
+
+        evicted = self.index.add({
+            'file': filename,
+            'category': category,
+            'timestamp': timestamp,
+            'confidence': round(float(confidence), 4) if confidence is not None else None,
+            'bytes': int(encoded.nbytes),
+        })
+        for entry in evicted:
+            if self.index.delete_file(entry):
+                self.deleted += 1
+
+    def stop(self, timeout=5):
+        """Finish the queued frames and stop the worker"""
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout=timeout)
+        print(f"📸 Screenshots: {self.saved} saved, {self.deleted} cleaned up, {self.dropped} dropped")
+
+
+# Win32 SendInput structures (defined everywhere, only used on Windows)
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class INPUT(ctypes.Structure):
+    class _INPUT(ctypes.Union):
+        # MOUSEINPUT is the largest member, so it sets the size SendInput expects
+        _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+    _anonymous_ = ("u",)
+    _fields_ = [("type", wintypes.DWORD), ("u", _INPUT)]
+
+
+class InputBackend:
+    """Where key events go; send() takes [(char, key_up)] and returns how many events were accepted"""
+    name = "base"
+
+    def send(self, events):
+        raise NotImplementedError
+
+
+class SendInputBackend(InputBackend):
+    """Inject the key events of each send() with one SendInput call (Windows)"""
+    name = "sendinput"
+
+    def __init__(self):
+        self.user32 = ctypes.windll.user32
+        self.scan_codes = {}
+
+    def virtual_key(self, char):
+        """Get the virtual key code (and cached scan code) for a character"""
+        if char == ' ':
+            vk = 0x20  # VK_SPACE
+        elif char == '\n':
+            vk = 0x0D  # VK_RETURN
+        else:
+            vk = ord(char.upper())
+        if vk not in self.scan_codes:
+            # Games reading raw input look at the scan code, so send both
+            self.scan_codes[vk] = self.user32.MapVirtualKeyW(vk, 0)
+        return vk, self.scan_codes[vk]
+
+    def send(self, events):
+        inputs = (INPUT * len(events))()
+        for item, (char, key_up) in zip(inputs, events):
+            vk, scan = self.virtual_key(char)
+            item.type = INPUT_KEYBOARD
+            item.ki = KEYBDINPUT(vk, scan, KEYEVENTF_KEYUP if key_up else 0, 0, 0)
+        # Returns how many events were inserted; 0 means another program (e.g. an elevated window) blocked them
+        return self.user32.SendInput(len(events), inputs, ctypes.sizeof(INPUT))
+
+
+class PyAutoGUIInputBackend(InputBackend):
+    """Send key events through pyautogui (non-Windows systems)"""
+    name = "pyautogui"
+
+    def send(self, events):
+        for char, key_up in events:
+            if key_up:
+                pyautogui.keyUp(char)
+            else:
+                pyautogui.keyDown(char)
+        return len(events)
+
+
+class RecordingInputBackend(InputBackend):
+    """Record key events instead of sending them (dry runs, benchmarks, tests on any OS)"""
+    name = "recording"
+
+    def __init__(self):
+        self.events = []  # (monotonic time, char, key_up)
+
+    def send(self, events):
+        now = time.monotonic()
+        self.events.extend((now, char, key_up) for char, key_up in events)
+        return len(events)
+
+    def presses(self):
+        """Get the characters pressed, one per completed down/up pair"""
+        return "".join(char for _, char, key_up in self.events if key_up)
+
+
+def create_input_backend(name='auto'):
+    """Create an input backend: 'sendinput', 'pyautogui', 'recording' or 'auto'"""
+    if name == 'sendinput' or (name == 'auto' and hasattr(ctypes, 'windll')):
+        return SendInputBackend()
+    if name == 'pyautogui' or (name == 'auto' and pyautogui is not None):
+        return PyAutoGUIInputBackend()
+    return RecordingInputBackend()
+
+
+def random_word_keys(rng):
+    """Get the keys of one random word"""
+    index = rng.integers(0, len(TYPING_WORDS))
+    return TYPING_WORD_KEYS[TYPING_WORD_STARTS[index]:TYPING_WORD_STARTS[index + 1]].tolist()
+
+
+def random_char_keys(rng, count):
+    """Get count random character keys"""
+    return TYPING_CHAR_KEYS[rng.integers(0, len(TYPING_CHAR_KEYS), count)].tolist()
+
+
+def with_delays(keys, rng, low=0.02, high=0.08):
+    """Pair keys with a random pause after each"""
+    return zip(keys, rng.uniform(low, high, len(keys)).tolist())
+
+
+def word_pattern(rng):
+    """A full word, then a space"""
+    yield from with_delays(random_word_keys(rng), rng)
+    yield SPACE_KEY, 0.0
+
+
+def chars_pattern(rng):
+    """A few random characters, then a space"""
+    yield from with_delays(random_char_keys(rng, rng.integers(2, 6)), rng)
+    yield SPACE_KEY, 0.0
+
+
+def mixed_pattern(rng):
+    """A mix of words and single characters, then a space"""
+    for _ in range(rng.integers(1, 4)):
+        if rng.integers(0, 2):
+            yield from with_delays(random_word_keys(rng), rng)
+        else:
+            yield from with_delays(random_char_keys(rng, 1), rng)
+    yield SPACE_KEY, 0.0
+
+
+def rapid_pattern(rng):
+    """A quick burst of single characters"""
+    yield from with_delays(random_char_keys(rng, rng.integers(1, 4)), rng, 0.02, 0.05)
+
+
+# Typing patterns by name: generators taking a NumPy Generator and yielding (key code, pause after the key)
+TYPING_PATTERNS = {
+    'word': word_pattern,
+    'chars': chars_pattern,
+    'mixed': mixed_pattern,
+    'rapid': rapid_pattern,
+}
+
+
+def typing_stream(rng, patterns=None, session_pause=(0.1, 0.5)):
+    """Endlessly yield (key, pause, pattern index) from randomly chosen patterns, with a longer pause after each"""
+    generators = list((TYPING_PATTERNS if patterns is None else patterns).values())
+    while True:
+        pattern = int(rng.integers(0, len(generators)))
+        previous = None
+        for key, delay in generators[pattern](rng):
+            if previous is not None:
+                yield previous
+            previous = (key, delay, pattern)
+        if previous is not None:
+            yield previous[0], previous[1] + rng.uniform(*session_pause), pattern
+
+
+def build_typing_plan(target_chars, seed=None, hold=0.035, chars_per_minute=None, patterns=None):
+    """Precompute a cycle's keys and start times (TYPING_PLAN_DTYPE) from a seeded RNG
+
+    Takes the first target_chars keys of typing_stream(); hold is the expected key hold time.
+    With chars_per_minute the schedule is stretched or squeezed to hit that rate exactly.
+    """
+    plan = np.empty(target_chars, dtype=TYPING_PLAN_DTYPE)
+    if not target_chars:
+        return plan
+    rng = np.random.default_rng(seed)
+    keys, delays, pattern = zip(*itertools.islice(typing_stream(rng, patterns), target_chars))
+    plan['key'] = keys
+    plan['pattern'] = pattern
+    intervals = np.asarray(delays, dtype=np.float64) + hold
+    if chars_per_minute:
+        # Keep the rhythm, but make one key start every 60 / chars_per_minute seconds on average
+        intervals *= target_chars * 60.0 / chars_per_minute / intervals.sum()
+    plan['at'] = np.concatenate(([0.0], np.cumsum(intervals)[:-1]))
+    return plan
+
+
+class TypingRateController:
+    """Spread a plan's remaining keys over the time left before the chest deadline, re-planning after every key"""
+    def __init__(self, plan, time_left, finish_margin=30.0):
+        self.time_left = time_left  # Callable: seconds until the deadline, or None when unknown
+        self.finish_margin = finish_margin  # Finish this many seconds before the deadline
+        # The plan's own intervals keep its rhythm; only their scale changes
+        starts = plan['at']
+        last = float(np.mean(np.diff(starts))) if len(starts) > 1 else 0.0
+        self.weights = np.diff(starts, append=starts[-1] + last) if len(starts) else np.zeros(0)
+        self.weights = np.maximum(self.weights, 1e-3)
+        self.remaining_weight = np.cumsum(self.weights[::-1])[::-1]  # Weight of each key and all after it
+        self.behind = 0  # Keys that started later than scheduled (input slower than planned)
+
+    def next_start(self, index, key_start):
+        """Get the monotonic start time of the key after index, given when key index started"""
+        left = self.time_left()
+        if left is None:
+            return key_start + self.weights[index]
+        # Measured from this key's start, so the time the key itself took is accounted for
+        budget = max(0.0, left + (time.monotonic() - key_start) - self.finish_margin)
+        return key_start + self.weights[index] * budget / self.remaining_weight[index]
+
+    def wait(self, deadline, wake=None):
+        """Wait for a key's start time (or until wake is set), counting keys that are already late"""
+        if time.monotonic() > deadline:
+            self.behind += 1
+        KeystrokeEngine.wait_until(deadline, wake)
+
+
+class KeystrokeEngine:
+    """Press each key exactly once through one input backend, holding and spacing keys by the monotonic clock"""
+    def __init__(self, backend, hold_time=(0.02, 0.05)):
+        self.backend = backend
+        self.hold_time = hold_time  # (min, max) seconds a key is held; (0, 0) sends down+up in one batch
+        self.sent = 0  # Keys whose down and up events were both accepted
+        self.rejected = 0  # Keys the system refused to inject
+        self.busy_time = 0.0
+
+    @staticmethod
+    def wait_until(deadline, wake=None):
+        """Sleep until a monotonic deadline, or until the threading.Event wake is set"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if wake is None:
+            time.sleep(remaining)
+        else:
+            wake.wait(remaining)
+
+    def press(self, char, hold=None):
+        """Press and release one key; returns True if both events were accepted"""
+        if hold is None:
+            hold = random.uniform(*self.hold_time)
+        start = time.monotonic()
+        if hold <= 0:
+            accepted = self.backend.send([(char, False), (char, True)])
+        else:
+            accepted = self.backend.send([(char, False)])
+            self.wait_until(start + hold)
+            accepted += self.backend.send([(char, True)])
+        self.busy_time += time.monotonic() - start
+        if accepted == 2:
+            self.sent += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def stats(self):
+        """Get sent/rejected key counts and time spent sending"""
+        return {'backend': self.backend.name, 'sent': self.sent, 'rejected': self.rejected,
+                'busy_time': self.busy_time}
+
+
+class KeystrokeVerifier:
+    """Compare the keys sent with the game's own typing counter and hold keys longer when the game drops them"""
+    def __init__(self, monitor, interval=60.0, min_keys=50, target_rate=0.95, max_hold=0.2):
+        self.monitor = monitor
+        self.reader = CounterReader()
+        self.interval = interval  # Seconds between counter reads while typing
+        self.min_keys = min_keys  # Fewest new keys worth judging; the counter lags a little behind the input
+        self.target_rate = target_rate  # Acceptance below this makes keys be held longer
+        self.max_hold = max_hold  # Longest key hold the verifier will set (seconds)
+        self.toggle_settle = 1.0  # Seconds the box takes to switch between timer and counter after a click
+        self.base_hold = monitor.keystrokes.hold_time  # Hold times are never shortened below the configured ones
+        self.last = None  # (game counter, keys sent) at the previous read
+        self.keys_sent = 0
+        self.keys_counted = 0
+        self.checks = 0
+        self.failed_reads = 0
+
+    def read_box(self, window):
+        """OCR the counter box once; returns the counter or None"""
+        crop = self.monitor.capture_frame(region=counter_region(window))
+        if crop.size == 0:
+            return None
+        reading = self.reader.read(crop)
+        return reading['value'] if reading else None
+
+    @on_detection_thread
+    def read_counter(self):
+        """Read the game's typing counter, or None; switches the box from the timer and back when needed"""
+        window = self.monitor.bongo_cat_window
+        if not window:
+            return None
+        try:
+            counter = self.read_box(window)
+            if counter is None and ':' in (self.reader.last_text or ""):
+                # The box shows the timer (click_timer_area switched it): show the counter, read it, then
+                # switch back for the timer re-reads, which run on this same thread and so cannot interleave
+                self.monitor.click_at(*timer_click_point(window), settle=self.toggle_settle)
+                try:
+                    counter = self.read_box(window)
+                finally:
+                    self.monitor.click_at(*timer_click_point(window), settle=self.toggle_settle)
+            return counter
+        except Exception as e:
+            print(f"Error reading typing counter: {e}")
+            return None
+
+    def start(self):
+        """Take the counter and sent-key baseline at the start of typing"""
+        self.keys_sent = 0
+        self.keys_counted = 0
+        self.checks = 0
+        self.failed_reads = 0
+        counter = self.read_counter()
+        self.last = None if counter is None else (counter, self.monitor.keystrokes.sent)
+
+    def check(self):
+        """Read the counter again; returns the acceptance rate since the last read, or None"""
+        counter = self.read_counter()
+        sent = self.monitor.keystrokes.sent
+        if counter is None:
+            self.failed_reads += 1
+            return None
+        if self.last is None:
+            self.last = (counter, sent)
+            return None
+        last_counter, last_sent = self.last
+        keys = sent - last_sent
+        if keys < self.min_keys:
+            return None
+        counted = counter - last_counter
+        self.last = (counter, sent)
+        if counted < 0 or counted > keys * 1.5:
+            # The counter restarted or was misread, so this interval says nothing
+            return None
+        rate = min(1.0, counted / keys)
+        self.checks += 1
+        self.keys_sent += keys
+        self.keys_counted += min(counted, keys)
+        self.adjust(rate)
+        return rate
+
+    def adjust(self, rate):
+        """Hold keys longer when the game misses them, and ease back once it counts them all"""
+        engine = self.monitor.keystrokes
+        low, high = engine.hold_time
+        if rate < self.target_rate and high < self.max_hold:
+            hold = (min(self.max_hold, max(low * 1.5, 0.01)), min(self.max_hold, max(high * 1.5, 0.02)))
+        elif rate >= 0.99 and (low > self.base_hold[0] or high > self.base_hold[1]):
+            hold = (max(self.base_hold[0], low * 0.9), max(self.base_hold[1], high * 0.9))
+        else:
+            return
+        engine.hold_time = hold
+        print(f"\n⌨️ Game counted {rate:.0%} of keys sent; key hold now {hold[0] * 1000:.0f}-{hold[1] * 1000:.0f} ms")
+
+    def acceptance(self):
+        """Get the share of checked keys the game counted, or None before the first check"""
+        return self.keys_counted / self.keys_sent if self.keys_sent else None
+
+    def stats(self):
+        """Get check counts, acceptance and the current key hold time"""
+        return {'checks': self.checks, 'failed_reads': self.failed_reads, 'keys_sent': self.keys_sent,
+                'keys_counted': self.keys_counted, 'acceptance': self.acceptance(),
+                'hold_time': self.monitor.keystrokes.hold_time}
+
+
+class TypingEngine:
+    """Type keys from the pattern generators through one loop, towards a key count, a time limit or until stopped"""
+    def __init__(self, press, patterns=None):
+        self.press = press  # Callable that presses one character
+        self.patterns = dict(TYPING_PATTERNS if patterns is None else patterns)
+        self.pattern_keys = np.zeros(len(self.patterns), np.int64)
+        self.pattern_time = np.zeros(len(self.patterns), np.float64)
+        self.wake = threading.Event()  # Set by stop() to cut the wait before the next key short
+
+    def stop(self):
+        """Wake a running loop so it sees its stop condition now rather than at the next key"""
+        self.wake.set()
+
+    def plan(self, target_chars, seed=None, hold=0.035, chars_per_minute=None):
+        """Precompute target_chars keys from these patterns (see build_typing_plan)"""
+        return build_typing_plan(target_chars, seed=seed, hold=hold, chars_per_minute=chars_per_minute,
+                                 patterns=self.patterns)
+
+    @staticmethod
+    def plan_items(plan):
+        """Turn a plan into (key, interval to the next key, pattern) items for run()"""
+        starts = plan['at']
+        intervals = np.diff(starts, append=starts[-1]) if len(starts) else starts
+        return zip(plan['key'].tolist(), intervals.tolist(), plan['pattern'].tolist())
+
+    def stream(self, seed=None, hold=0.035):
+        """Endless (key, interval to the next key, pattern) items for time-limited or unbounded typing"""
+        rng = np.random.default_rng(seed)
+        for key, delay, pattern in typing_stream(rng, self.patterns):
+            yield key, delay + hold, pattern
+
+    def run(self, items, stop=None, deadline=None, pace=None, on_key=None):
+        """Press items until they run out, stop() is true or the monotonic deadline passes; returns the keys pressed
+
+        Keys start on a fixed schedule from their intervals, or when pace (a TypingRateController) says so.
+        on_key(count) is called after every key. Callers that make stop() true should also call
+        stop(), so the wait for the next key ends at once.
+        """
+        # Cleared before the first stop() check, so a stop requested before the loop starts is still seen
+        self.wake.clear()
+        self.pattern_keys[:] = 0
+        self.pattern_time[:] = 0
+        count = 0
+        next_start = time.monotonic()
+        previous = None  # (pattern, start) of the last key, to charge its time to its pattern
+        for index, (key, interval, pattern) in enumerate(items):
+            if stop and stop():
+                break
+            wait_until = next_start if deadline is None else min(next_start, deadline)
+            if pace:
+                pace.wait(wait_until, self.wake)
+            else:
+                KeystrokeEngine.wait_until(wait_until, self.wake)
+            # Woken early or waited long: the stop condition or deadline may have been reached meanwhile
+            if stop and stop():
+                break
+            key_start = time.monotonic()
+            if deadline is not None and key_start >= deadline:
+                break
+            if previous:
+                self.pattern_time[previous[0]] += key_start - previous[1]
+            self.press(chr(key))
+            count += 1
+            self.pattern_keys[pattern] += 1
+            previous = (pattern, key_start)
+            next_start = pace.next_start(index, key_start) if pace else next_start + interval
+            if on_key:
+                on_key(count)
+        if previous:
+            self.pattern_time[previous[0]] += time.monotonic() - previous[1]
+        return count
+
+    def stats(self):
+        """Get keys, time and keys per minute of every pattern in the last run"""
+        return {name: {'keys': int(keys), 'time': float(spent),
+                       'keys_per_minute': keys / spent * 60 if spent > 0 else 0.0}
+                for name, keys, spent in zip(self.patterns, self.pattern_keys, self.pattern_time)}
+
+
+class GameInstance:
+    """One Bongo Cat game (process + window) with its own timer, chest location and stats"""
+    def __init__(self, monitor, pid, info, window):
+        self.monitor = monitor
+        self.pid = pid
+        self.info = info
+        self.window = window
+        self.timer_tracker = TimerTracker(self)
+        self.chest_hot_spot = None
+        self.state = 'counting'  # counting -> watching (timer expired) -> counting (chest clicked)
+        self.next_read = 0.0  # Monotonic time of the next timer read
+        self.next_sample = 0.0  # Monotonic time of the next chest sample while watching
+        self.watch_deadline = None
+        self.frame = None  # Shared desktop frame of the current tick
+        self.timer_shown = False  # Whether the counter box has been clicked to show the timer this cycle
+        self.stats = {'chests': 0, 'timer_reads': 0, 'chest_samples': 0, 'busy_ms': 0.0, 'watch_timeouts': 0}
+
+    @property
+    def name(self):
+        return f"{self.info['name']} (PID {self.pid})"
+
+    def show_timer(self):
+        """Click this game's counter box so it shows the timer, as single-game mode does every cycle"""
+        self.monitor.click_at(*timer_click_point(self.window), settle=1.0)
+        self.timer_shown = True
+        self.frame = None  # The shared frame was captured before the click
+
+    def read_timer_with_ocr(self):
+        """Read this game's timer from the shared frame (or its own small capture between ticks)"""
+        self.stats['timer_reads'] += 1
+        try:
+            x, y, width, height = timer_region(self.window)
+            if self.frame is not None:
+                crop = self.frame[max(0, y):y + height, max(0, x):x + width]
+            else:
+                crop = self.monitor.capture_frame(region=(x, y, width, height))
+            if crop.size == 0:
+                return None
+            reading = self.monitor.timer_reader.read(crop)
+            return reading['value'] if reading else None
+        except Exception as e:
+            print(f"Error reading timer of {self.name}: {e}")
+            return None
+
+    def next_due(self):
+        """Get the monotonic time this game next needs the screen"""
+        if self.state == 'watching':
+            return self.next_sample
+        remaining = self.timer_tracker.remaining()
+        if remaining is None:
+            return self.next_read
+        return min(self.next_read, time.monotonic() + remaining)
+
+
+class InstanceManager:
+    """Drive every running Bongo Cat game from one process: one process scan, one capture per tick, one template cache"""
+    def __init__(self, monitor, default_cycle=30 * 60, rescan_interval=60.0):
+        self.monitor = monitor
+        self.default_cycle = default_cycle  # Assumed cycle length when a timer cannot be read
+        self.rescan_interval = rescan_interval  # Seconds between full process scans that find newly started games
+        self.next_rescan = 0.0
+        self.window_error_reported = False  # Report a missing window API once, not on every discovery
+        self.instances = {}  # pid -> GameInstance
+        self.ticks = 0
+        self.tick_ms = 0.0
+
+    def find_game_windows(self):
+        """Get every visible Bongo Cat window (none where pygetwindow is unavailable, i.e. off Windows)"""
+        try:
+            import pygetwindow as gw
+            return [window for window in gw.getAllWindows()
+                    if window.title and 'bongo' in window.title.lower()
+                    and window.width > 100 and window.height > 100]
+        except Exception as e:
+            if not self.window_error_reported:
+                print(f"Error listing windows: {e}")
+                self.window_error_reported = True
+            return []
+
+    def discover(self):
+        """Match running Bongo Cat processes to their windows; adds new games and drops closed ones"""
+        # The cheap PID check only notices games closing; a periodic full scan finds games started since
+        now = time.monotonic()
+        rescan = now >= self.next_rescan
+        if rescan:
+            self.next_rescan = now + self.rescan_interval
+        try:
+            is_running, processes = self.monitor.is_bongo_cat_running(rescan)
+            processes = {info['pid']: info for info in processes} if is_running else {}
+            windows = self.find_game_windows()
+        except Exception as e:
+            # Keep serving the games already known; the next discovery tries again
+            print(f"\nError discovering Bongo Cat games: {e}")
+            return
+
+        # Pair windows with processes by owner PID
+        by_pid = {}
+        for window in windows:
+            pid = window_pid(window)
+            if pid in processes:
+                by_pid[pid] = window
+
+        for pid in list(self.instances):
+            if pid not in by_pid:
+                print(f"❌ {self.instances.pop(pid).name} is gone")
+        for pid, window in by_pid.items():
+            if pid in self.instances:
+                self.instances[pid].window = window  # Follow moved windows
+            else:
+                instance = GameInstance(self.monitor, pid, processes[pid], window)
+                self.instances[pid] = instance
+                print(f"🎮 Managing {instance.name}: window at ({window.left}, {window.top}) {window.width}x{window.height}")
+
+    @on_detection_thread
+    def tick(self, due):
+        """Capture the desktop once, update every due game's timer, then search all expired games' chests together"""
+        start = time.perf_counter()
+        frame = self.monitor.capture_frame()
+        now = time.monotonic()
+        watching = []
+        for instance in due:
+            instance.frame = frame
+            try:
+                if self.update_timer(instance, now):
+                    watching.append(instance)
+            except Exception as e:
+                # One game's failure must not stop the others
+                print(f"\nError updating {instance.name}: {e}")
+                instance.next_read = now + instance.timer_tracker.min_interval
+            finally:
+                instance.frame = None
+        if watching:
+            try:
+                matches = self.find_chests(watching, frame)
+            except Exception as e:
+                print(f"\nError searching for chests: {e}")
+                matches = [None] * len(watching)
+            for instance, match in zip(watching, matches):
+                try:
+                    self.handle_chest(instance, match, now)
+                except Exception as e:
+                    print(f"\nError handling the chest of {instance.name}: {e}")
+                    instance.next_sample = now + 1.0 / self.monitor.chest_watcher.fps
+        self.ticks += 1
+        self.tick_ms += (time.perf_counter() - start) * 1000
+
+    def update_timer(self, instance, now):
+        """Re-read a counting game's timer when due; returns True once the game is watching for its chest"""
+        if instance.state == 'watching':
+            return True
+        tracker = instance.timer_tracker
+        if now >= instance.next_read:
+            if not instance.timer_shown:
+                instance.show_timer()
+            if tracker.read() is None and not tracker.samples:
+                instance.timer_shown = False  # Nothing read yet: click the box again before the next read
+            if tracker.remaining() is None:
+                tracker.start(self.default_cycle)
+            instance.next_read = now + tracker.next_read_delay(tracker.remaining())
+        if tracker.remaining() > 0:
+            return False
+        print(f"\n⏰ {instance.name}: timer expired, watching for the chest")
+        instance.state = 'watching'
+        instance.watch_deadline = now + self.monitor.chest_watch_timeout
+        return True
+
+    def find_chests(self, instances, frame):
+        """Search each game's chest regions in batched passes over the shared frame; returns one match per game"""
+        monitor = self.monitor
+        template = monitor.templates.get('chest')
+        if template is None:
+            return [None] * len(instances)
+        sample_start = time.perf_counter()
+
+        # Only each game's own hot spot and window: a full-screen search would find another game's chest
+        pending = {}
+        for index, instance in enumerate(instances):
+            regions = chest_search_regions(frame.shape[1], frame.shape[0], template,
+                                           instance.chest_hot_spot, monitor.chest_hot_spot_margin,
+                                           instance.window, monitor.chest_window_margin, full_screen=False)
+            # A window outside the captured screen (e.g. on another monitor) has nothing to search
+            if regions:
+                pending[index] = [region for _, region in regions]
+
+        # One pass per region rank: every hot spot together, then the windows of the games still missing
+        matches = [None] * len(instances)
+        while pending:
+            indices = list(pending)
+            batch = monitor.matcher.match_many([('chest', pending[index].pop(0)) for index in indices],
+                                               frame, parallel=True)
+            for index, match in zip(indices, batch):
+                if match and (matches[index] is None or match['confidence'] > matches[index]['confidence']):
+                    matches[index] = match
+                if (match and match['found']) or not pending[index]:
+                    del pending[index]
+
+        cost = (time.perf_counter() - sample_start) * 1000 / len(instances)
+        for instance in instances:
+            instance.stats['chest_samples'] += 1
+            instance.stats['busy_ms'] += cost
+        return matches
+
+    def handle_chest(self, instance, match, now):
+        """Click a found chest, give up after the watch timeout, or schedule the next sample"""
+        monitor = self.monitor
+        if match and match['found']:
+            print(f"\n🎁 {instance.name}: chest found (confidence {match['confidence']:.4f}), clicking")
+            instance.chest_hot_spot = (match['top_left'][0], match['top_left'][1], match['width'], match['height'])
+            monitor.click_at(*match['center'], clicks=2)
+            instance.stats['chests'] += 1
+            self.start_cycle(instance)
+        elif now >= instance.watch_deadline:
+            print(f"\n⚠️ {instance.name}: no chest after {monitor.chest_watch_timeout // 60} minutes, starting a new cycle")
+            instance.stats['watch_timeouts'] += 1
+            self.start_cycle(instance)
+        else:
+            instance.next_sample = now + 1.0 / monitor.chest_watcher.fps
+
+    def start_cycle(self, instance):
+        """Begin counting down the next cycle, reading the new timer shortly"""
+        instance.state = 'counting'
+        instance.timer_shown = False
+        instance.timer_tracker.reset()
+        instance.timer_tracker.start(self.default_cycle)
+        instance.next_read = time.monotonic() + 5
+
+    async def run_async(self):
+        """Serve all games until stopped, sleeping until the next game (or process check) is due"""
+        monitor = self.monitor
+        next_discovery = 0.0
+        next_progress = 0.0
+        while not monitor.stop_event.is_set():
+            now = time.monotonic()
+            if now >= next_discovery:
+                await monitor.orchestrator.blocking(self.discover)
+                next_discovery = now + monitor.process_check_interval
+
+            due = [instance for instance in self.instances.values() if instance.next_due() <= now]
+            if due:
+                await monitor.orchestrator.blocking(self.tick, due)
+
+            if now >= next_progress:
+                self.show_progress()
+                next_progress = now + monitor.progress_interval
+
+            wake = min([next_discovery, next_progress] + [instance.next_due() for instance in self.instances.values()])
+            await asyncio.sleep(max(0.0, wake - time.monotonic()))
+
+    def show_progress(self):
+        """Print one status line covering every game"""
+        parts = []
+        for instance in self.instances.values():
+            if instance.state == 'watching':
+                parts.append(f"PID {instance.pid}: watching")
+            else:
+                remaining = max(0, int(instance.timer_tracker.remaining() or 0))
+                parts.append(f"PID {instance.pid}: {remaining // 60:02d}:{remaining % 60:02d}")
+        print(f"\r🐱 {len(self.instances)} game(s) - " + " | ".join(parts or ["waiting for Bongo Cat"]), end="", flush=True)
+
+    def run(self):
+        """Serve all games from synchronous code until Ctrl+C or shutdown()"""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("\n\n⏹️ Multi-instance mode stopped by user")
+            self.monitor.stop_event.set()
+        print()
+        self.report()
+
+    def report(self):
+        """Print per-game and shared costs"""
+        if self.ticks:
+            print(f"📊 {self.ticks} shared captures, {self.tick_ms / self.ticks:.1f} ms per tick, "
+                  f"{self.monitor.process_tracker.full_scans} full process scans")
+        for instance in self.instances.values():
+            stats = instance.stats
+            samples = stats['chest_samples']
+            per_sample = stats['busy_ms'] / samples if samples else 0.0
+            print(f"📊 {instance.name}: {stats['chests']} chests, {stats['timer_reads']} timer reads, "
+                  f"{samples} chest samples ({per_sample:.1f} ms each), {stats['watch_timeouts']} watch timeouts")
+
+
 class SteamGameMonitor:
-    def __init__(self):
+    def __init__(self, save_debug_screenshots=False, capture_backend=None, dry_run=False,
+                 detection_log_path="./logs/detections.bin"):
         self.is_game_running = False
         self.countdown_active = False
-        self.typing_thread = None
         self.stop_typing = False
         self.screenshot_dir = "./screenshot"
         self.bongo_cat_window = None
         self.max_screenshots_per_category = 5  # Keep 5 most recent screenshots per category
+        self.save_debug_screenshots = save_debug_screenshots  # Only write frames to disk when asked
+        self.dry_run = dry_run  # Detect but never move the mouse (benchmarks, replayed frames)
+        self.chest_hot_spot = None  # (x, y, width, height) of the last chest found
+        self.chest_hot_spot_margin = 40  # Pixels searched around the last chest location
+        self.chest_window_margin = 100  # Pixels searched around the Bongo Cat window
+        self.chest_watch_timeout = 30 * 60  # Seconds to keep watching for the chest before giving up
+        self.stop_event = threading.Event()  # Set to cancel any waiting or watching immediately
+        self.capture = capture_backend or create_capture_backend()
+        self.process_tracker = ProcessTracker()
+        self.templates = TemplateCache({
+            'chest': "chest.png",
+            'taskbar_icon': "App_icon_on_task_bar.png",
+        })
+        self.matcher = TemplateMatcher(self.templates, thresholds={
+            'chest': 0.7,
+            'taskbar_icon': 0.7,
+        })
+        self.chest_watcher = ChestWatcher(self, fps=1.0, cpu_budget=0.05)
+        self.timer_reader = TimerReader()
+        self.timer_tracker = TimerTracker(self)
+        self.orchestrator = CycleOrchestrator(self)
+        # Captures and template matching run on this one thread, so pooled frame buffers are never duplicated
+        self.detector = ThreadPoolExecutor(max_workers=1, thread_name_prefix="augo-cat-detect")
+        self.detector_local = threading.local()
+        self.instance_manager = InstanceManager(self)
+        self.keystrokes = KeystrokeEngine(RecordingInputBackend() if dry_run else create_input_backend())
+        self.typing = TypingEngine(self.send_keypress_enhanced)  # Pattern generators and the typing loop
+        self.typing_seed = None  # Set for a reproducible typing plan (benchmarks)
+        self.typing_chars_per_minute = None  # None keeps the natural rhythm; a number hits that rate exactly
+        self.typing_rate_control = True  # Spread each cycle's keys evenly up to the chest deadline
+        self.typing_finish_margin = 30.0  # Seconds before the deadline the last key should be typed
+        self.keystroke_verifier = KeystrokeVerifier(self)  # Checks typed keys against the game's own counter
+        self.verify_keystrokes = True
+        self.progress_interval = 5.0  # Seconds between countdown display refreshes
+        self.process_check_interval = 10.0  # Seconds between Bongo Cat process checks during a countdown
+        self.detection_log = DetectionLog(detection_log_path) if detection_log_path else None
+        self.matcher.log = self.detection_log
+        self.archiver = None
         
-        # Create screenshot directory if it doesn't exist
-        if not os.path.exists(self.screenshot_dir):
-            os.makedirs(self.screenshot_dir)
-            print(f"Created screenshot directory: {self.screenshot_dir}")
-    
-    def cleanup_old_screenshots(self):
-        """Keep only the most recent screenshots per category for OpenCV training"""
-        try:
+        if self.save_debug_screenshots:
+            # Create screenshot directory if it doesn't exist
             if not os.path.exists(self.screenshot_dir):
-                return
-            
-            # Define screenshot categories based on filename patterns
-            categories = {
-                'chest_found': [],
-                'chest_search': [],
-                'taskbar_icon_found': [],
-                'taskbar_search': [],
-                'chest_not_found': [],
-                'bongo_cat': []
-            }
-            
-            # Categorize all screenshot files
-            for filename in os.listdir(self.screenshot_dir):
-                if filename.endswith(('.png', '.jpg', '.jpeg')):
-                    filepath = os.path.join(self.screenshot_dir, filename)
-                    mtime = os.path.getmtime(filepath)
-                    
-                    # Determine category based on filename
-                    if 'chest_found' in filename:
-                        categories['chest_found'].append((mtime, filepath))
-                    elif 'chest_search' in filename:
-                        categories['chest_search'].append((mtime, filepath))
-                    elif 'taskbar_icon_found' in filename:
-                        categories['taskbar_icon_found'].append((mtime, filepath))
-                    elif 'taskbar_search' in filename:
-                        categories['taskbar_search'].append((mtime, filepath))
-                    elif 'chest_not_found' in filename:
-                        categories['chest_not_found'].append((mtime, filepath))
-                    elif 'bongo_cat' in filename:
-                        categories['bongo_cat'].append((mtime, filepath))
-            
-            total_deleted = 0
-            total_kept = 0
-            
-            # Clean up each category
-            for category, files in categories.items():
-                if not files:
-                    continue
-                    
-                # Sort by modification time (newest first)
-                files.sort(reverse=True)
-                
-                # Keep only the most recent ones per category
-                if len(files) > self.max_screenshots_per_category:
-                    files_to_delete = files[self.max_screenshots_per_category:]
-                    for _, filepath in files_to_delete:
-                        try:
-                            os.remove(filepath)
-                            print(f"🗑️ Cleaned up old {category}: {os.path.basename(filepath)}")
-                            total_deleted += 1
-                        except Exception as e:
-                            print(f"⚠️ Could not delete {filepath}: {e}")
-                    
-                    kept_count = min(len(files), self.max_screenshots_per_category)
-                    total_kept += kept_count
-                    print(f"📸 Kept {kept_count} most recent {category} screenshots")
-                else:
-                    total_kept += len(files)
-            
-            if total_deleted > 0:
-                print(f"📸 Screenshot cleanup complete: {total_deleted} deleted, {total_kept} kept")
-            else:
-                print(f"📸 Screenshot storage: {total_kept} images (within limits)")
-                
-        except Exception as e:
-            print(f"⚠️ Error cleaning up screenshots: {e}")
-        
+                os.makedirs(self.screenshot_dir)
+                print(f"Created screenshot directory: {self.screenshot_dir}")
+            self.archiver = ScreenshotArchiver(self.screenshot_dir, self.max_screenshots_per_category)
+    
+    def shutdown(self):
+        """Flush the detection log and queued debug screenshots before the program exits"""
+        self.stop_event.set()
+        self.stop_typing = True
+        self.typing.stop()
+        self.orchestrator.cancel()
+        self.orchestrator.close()
+        self.detector.shutdown(wait=False)
+        self.matcher.close()
+        if self.detection_log:
+            self.detection_log.close()
+        if self.archiver:
+            self.archiver.stop()
+    
+    def run_detection(self, func, *args, **kwargs):
+        """Call func on the detection thread and wait for its result (directly when already on it)"""
+        if getattr(self.detector_local, 'active', False):
+            return func(*args, **kwargs)
+
+        def run():
+            self.detector_local.active = True
+            return func(*args, **kwargs)
+        return self.detector.submit(run).result()
+
+    def capture_frame(self, region=None):
+        """Capture the screen (or region=(x, y, width, height)) as an in-memory BGR/BGRA NumPy array"""
+        return self.capture.capture(region)
+
+    def save_debug_frame(self, frame, name, timestamp, confidence=None, box=None, label=None):
+        """Queue a debug frame for the background archiver, only if debug screenshots are enabled"""
+        if not self.save_debug_screenshots:
+            return None
+        return self.archiver.submit(frame, name, timestamp, confidence=confidence, box=box, label=label)
+
     def is_steam_game_running(self):
         """Check if any Steam game is currently running"""
         steam_processes = []
         
         for proc in psutil.process_iter(['pid', 'name', 'exe']):
             try:
-                if proc.info['exe'] and 'steam' in proc.info['exe'].lower():
+                name = proc.info['name'] or ''
+                if proc.info['exe'] and STEAM_PATH_PATTERN.search(proc.info['exe']):
                     # Check if it's a game process (not just Steam client)
-                    if any(game_indicator in proc.info['name'].lower() for game_indicator in 
-                          ['.exe', 'game', 'launcher', 'client']):
-                        # Additional check: Steam games usually have specific patterns
-                        if not any(steam_client in proc.info['name'].lower() for steam_client in 
-                                 ['steam.exe', 'steamwebhelper.exe', 'steamservice.exe']):
-                            steam_processes.append(proc.info['name'])
+                    if GAME_INDICATOR_PATTERN.search(name) and not STEAM_CLIENT_PATTERN.search(name):
+                        steam_processes.append(proc.info['name'])
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
         
         return len(steam_processes) > 0, steam_processes
     
-    def is_bongo_cat_running(self):
-        """Check if Bongo Cat game is specifically running"""
-        bongo_processes = []
-        
-        # Bongo Cat process names (based on actual detection)
-        bongo_names = [
-            'bongocat.exe',
-            'bongo cat',
-            'bongocat',
-            'bongo-cat',
-            'bongo_cat',
-            'unitycrashhandler64.exe'  # Unity crash handler for Bongo Cat
-        ]
-        
-        for proc in psutil.process_iter(['pid', 'name', 'exe']):
-            try:
-                proc_name = proc.info['name'].lower()
-                proc_exe = proc.info['exe'].lower() if proc.info['exe'] else ''
-                
-                # Check if process name contains bongo cat
-                for bongo_name in bongo_names:
-                    if bongo_name in proc_name or bongo_name in proc_exe:
-                        bongo_processes.append({
-                            'name': proc.info['name'],
-                            'exe': proc.info['exe'],
-                            'pid': proc.info['pid']
-                        })
-                        break
-                        
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        
-        return len(bongo_processes) > 0, bongo_processes
+    def is_bongo_cat_running(self, rescan=False):
+        """Check if Bongo Cat game is specifically running (cheap PID check once it has been found)"""
+        return self.process_tracker.check(rescan)
     
     def list_all_running_processes(self):
         """List all running processes to help identify Bongo Cat"""
         print("Scanning all running processes...")
         print("Looking for processes that might be Bongo Cat...")
         
-        all_processes = []
+        # Filter for potential game processes
+        game_processes = []
         for proc in psutil.process_iter(['pid', 'name', 'exe']):
             try:
-                all_processes.append({
-                    'name': proc.info['name'],
-                    'exe': proc.info['exe'],
-                    'pid': proc.info['pid']
-                })
+                name = proc.info['name'] or ''
+                exe = proc.info['exe'] or ''
+                
+                # Look for game-related keywords
+                if GAME_PROCESS_PATTERN.search(name) or GAME_PROCESS_PATTERN.search(exe):
+                    game_processes.append({
+                        'name': proc.info['name'],
+                        'exe': proc.info['exe'],
+                        'pid': proc.info['pid']
+                    })
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
         
-        # Filter for potential game processes
-        game_processes = []
-        for proc in all_processes:
-            name = proc['name'].lower()
-            exe = proc['exe'].lower() if proc['exe'] else ''
-            
-            # Look for game-related keywords
-            if any(keyword in name or keyword in exe for keyword in 
-                   ['game', 'bongo', 'cat', 'steam', 'unity', 'unreal', 'game.exe']):
-                game_processes.append(proc)
-        
         print(f"\nFound {len(game_processes)} potential game processes:")
         for proc in game_processes[:20]:  # Show first 20
             print(f"  - {proc['name']} (PID: {proc['pid']})")
@@ -261,9 +2459,8 @@ class SteamGameMonitor:
                 return False
             
             # Estimate timer area (left box under the cat)
-            # Adjust these coordinates based on your Bongo Cat layout
-            timer_x = x + width // 4  # Left side of window
-            timer_y = y + height // 2  # Middle height of window
+            # Adjust timer_click_point() to your Bongo Cat layout
+            timer_x, timer_y = timer_click_point(self.bongo_cat_window)
             
             # Validate calculated coordinates
             if timer_x < 0 or timer_y < 0:
@@ -288,6 +2485,7 @@ class SteamGameMonitor:
             print(f"Error clicking timer area: {e}")
             return False
     
+    @on_detection_thread
     def read_timer_with_ocr(self):
         """Read timer using OCR from Bongo Cat window"""
         try:
@@ -296,35 +2494,18 @@ class SteamGameMonitor:
                 if not self.find_bongo_cat_window():
                     return None
             
-            # Get window coordinates
-            x, y, width, height = self.bongo_cat_window.left, self.bongo_cat_window.top, self.bongo_cat_window.width, self.bongo_cat_window.height
-            
-            # Take screenshot of the window
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
+            # Capture only the timer area
+            timer_crop = self.capture_frame(region=timer_region(self.bongo_cat_window))
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = os.path.join(self.screenshot_dir, f"bongo_cat_{timestamp}.png")
-            screenshot.save(screenshot_path)
-            
-            # Convert to OpenCV format
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            
-            # Crop to timer area (adjust coordinates based on your layout)
-            timer_region = img[height//3:height//2, width//6:width//3]  # Adjust these values
-            
-            # Use OCR to read timer
-            timer_text = pytesseract.image_to_string(timer_region, config='--psm 8 -c tessedit_char_whitelist=0123456789:')
-            
-            # Parse timer format (MM:SS)
-            timer_match = re.search(r'(\d{1,2}):(\d{2})', timer_text.strip())
-            if timer_match:
-                minutes = int(timer_match.group(1))
-                seconds = int(timer_match.group(2))
-                total_seconds = minutes * 60 + seconds
-                print(f"OCR detected timer: {minutes:02d}:{seconds:02d} ({total_seconds} seconds)")
-                return total_seconds
-            else:
-                print(f"Could not parse timer from OCR: '{timer_text.strip()}'")
+            self.save_debug_frame(timer_crop, "bongo_cat", timestamp)
+
+            reading = self.timer_reader.read(timer_crop)
+            if reading is None:
                 return None
+            total_seconds = reading['value']
+            print(f"OCR detected timer: {total_seconds // 60:02d}:{total_seconds % 60:02d} "
+                  f"({total_seconds} seconds, via {reading['method']})")
+            return total_seconds
                 
         except Exception as e:
             print(f"Error reading timer with OCR: {e}")
@@ -333,18 +2514,15 @@ class SteamGameMonitor:
     def get_smart_countdown_duration(self):
         """Get countdown duration using OCR timer reading"""
         print("Attempting to read game timer with OCR...")
+        self.timer_tracker.reset()
         
         # Try to find Bongo Cat window first
         if not self.find_bongo_cat_window():
             print("Could not find Bongo Cat window, using default 30 minutes")
             return 30 * 60
         
-        # Check if Tesseract is available
-        try:
-            pytesseract.get_tesseract_version()
-            print("Tesseract OCR is available")
-        except Exception as e:
-            print(f"Tesseract OCR not available: {e}")
+        # Tesseract is only needed until the timer digits have been learned
+        if self.timer_reader.templates is None and not self.timer_reader.tesseract_available():
             print("Please install Tesseract OCR for timer reading functionality")
             print("For now, using default 30 minutes")
             return 30 * 60
@@ -358,365 +2536,143 @@ class SteamGameMonitor:
         
         if remaining_seconds is not None and remaining_seconds > 0:
             print(f"Using OCR timer: {remaining_seconds} seconds remaining")
+            self.timer_tracker.observe(remaining_seconds)
             return remaining_seconds
         else:
             print("OCR failed, using default 30 minutes")
             return 30 * 60
     
-    def get_random_words(self):
-        """Generate random words for typing"""
-        words = [
-            "hello", "world", "python", "programming", "computer", "keyboard", "mouse",
-            "screen", "monitor", "desktop", "window", "application", "software", "hardware",
-            "internet", "network", "database", "algorithm", "function", "variable", "class",
-            "object", "method", "parameter", "argument", "return", "import", "module",
-            "library", "framework", "development", "coding", "debugging", "testing",
-            "steam", "game", "gaming", "player", "level", "score", "achievement",
-            "bongo", "cat", "chest", "icon", "click", "screenshot", "image", "detection"
-        ]
-        return random.choice(words)
-    
-    def get_random_chars(self):
-        """Generate random single characters for more frequent keypresses"""
-        chars = "abcdefghijklmnopqrstuvwxyz0123456789"
-        return random.choice(chars)
-    
-    def send_keypress_winapi(self, char):
-        """Send keypress using Windows API for more realistic simulation"""
-        try:
-            # Virtual key codes
-            VK_SPACE = 0x20
-            VK_RETURN = 0x0D
-            
-            if char == ' ':
-                vk_code = VK_SPACE
-            elif char == '\n':
-                vk_code = VK_RETURN
-            else:
-                vk_code = ord(char.upper())
-            
-            # Send key down with longer duration for better detection
-            ctypes.windll.user32.keybd_event(vk_code, 0, 0, 0)
-            time.sleep(random.uniform(0.05, 0.15))  # Longer key down time
-            # Send key up
-            ctypes.windll.user32.keybd_event(vk_code, 0, 2, 0)  # 2 = KEYEVENTF_KEYUP
-            
-        except Exception as e:
-            print(f"WinAPI keypress error: {e}")
-            # Fallback to pyautogui
-            pyautogui.press(char)
-    
-    def send_keypress_pyautogui(self, char):
-        """Send keypress using pyautogui with enhanced timing"""
-        try:
-            # Use pyautogui with more realistic timing
-            pyautogui.keyDown(char)
-            time.sleep(random.uniform(0.05, 0.15))  # Longer key down time
-            pyautogui.keyUp(char)
-        except Exception as e:
-            print(f"PyAutoGUI keypress error: {e}")
-    
     def send_keypress_enhanced(self, char):
-        """Enhanced keypress method that tries multiple approaches"""
+        """Press one key exactly once through the keystroke engine"""
         try:
-            # Method 1: Windows API
-            self.send_keypress_winapi(char)
-            time.sleep(random.uniform(0.01, 0.03))
-            
-            # Method 2: PyAutoGUI as backup (for better detection)
-            self.send_keypress_pyautogui(char)
-            
+            if not self.keystrokes.press(char):
+                print(f"⚠️ Keypress '{char}' was blocked by the system")
         except Exception as e:
-            print(f"Enhanced keypress error: {e}")
-            # Final fallback
-            pyautogui.press(char)
+            print(f"Keypress error: {e}")
     
     def type_random_words_with_target(self, target_chars):
-        """Type random words with character target tracking"""
-        keypress_count = 0
+        """Type a precomputed plan of target_chars keys, replaying its schedule against the monotonic clock"""
         self.chars_typed_this_cycle = 0
+        hold = sum(self.keystrokes.hold_time) / 2
+        plan = self.typing.plan(target_chars, seed=self.typing_seed, hold=hold,
+                                chars_per_minute=self.typing_chars_per_minute)
         
-        while not self.stop_typing and self.countdown_active and self.chars_typed_this_cycle < target_chars:
-            try:
-                # Mix of different typing patterns for better detection
-                typing_pattern = random.choice(['word', 'chars', 'mixed', 'rapid'])
-                
-                if typing_pattern == 'word':
-                    # Type a full word with enhanced keypress
-                    word = self.get_random_words()
-                    for char in word:
-                        if self.stop_typing or not self.countdown_active or self.chars_typed_this_cycle >= target_chars:
-                            break
-                        self.send_keypress_enhanced(char)
-                        keypress_count += 1
-                        self.chars_typed_this_cycle += 1
-                        time.sleep(random.uniform(0.02, 0.08))
-                    
-                    # Add space
-                    if not self.stop_typing and self.countdown_active and self.chars_typed_this_cycle < target_chars:
-                        self.send_keypress_enhanced(' ')
-                        keypress_count += 1
-                        self.chars_typed_this_cycle += 1
-                    
-                elif typing_pattern == 'chars':
-                    # Type individual characters more frequently
-                    for _ in range(random.randint(2, 5)):
-                        if self.stop_typing or not self.countdown_active or self.chars_typed_this_cycle >= target_chars:
-                            break
-                        char = self.get_random_chars()
-                        self.send_keypress_enhanced(char)
-                        keypress_count += 1
-                        self.chars_typed_this_cycle += 1
-                        time.sleep(random.uniform(0.02, 0.08))
-                    
-                    # Add space
-                    if not self.stop_typing and self.countdown_active and self.chars_typed_this_cycle < target_chars:
-                        self.send_keypress_enhanced(' ')
-                        keypress_count += 1
-                        self.chars_typed_this_cycle += 1
-                
-                elif typing_pattern == 'rapid':
-                    # Rapid single character typing for maximum detection
-                    for _ in range(random.randint(1, 3)):
-                        if self.stop_typing or not self.countdown_active or self.chars_typed_this_cycle >= target_chars:
-                            break
-                        char = self.get_random_chars()
-                        # Try multiple methods for each character
-                        self.send_keypress_winapi(char)
-                        time.sleep(random.uniform(0.01, 0.03))
-                        self.send_keypress_pyautogui(char)
-                        keypress_count += 2
-                        self.chars_typed_this_cycle += 1
-                        time.sleep(random.uniform(0.02, 0.05))
-                
-                else:  # mixed
-                    # Mix of words and individual characters
-                    for _ in range(random.randint(1, 3)):
-                        if self.stop_typing or not self.countdown_active or self.chars_typed_this_cycle >= target_chars:
-                            break
-                        if random.choice([True, False]):
-                            # Type a word
-                            word = self.get_random_words()
-                            for char in word:
-                                if self.stop_typing or not self.countdown_active or self.chars_typed_this_cycle >= target_chars:
-                                    break
-                                self.send_keypress_enhanced(char)
-                                keypress_count += 1
-                                self.chars_typed_this_cycle += 1
-                                time.sleep(random.uniform(0.02, 0.08))
-                        else:
-                            # Type individual characters
-                            char = self.get_random_chars()
-                            self.send_keypress_enhanced(char)
-                            keypress_count += 1
-                            self.chars_typed_this_cycle += 1
-                            time.sleep(random.uniform(0.02, 0.08))
-                    
-                    # Add space
-                    if not self.stop_typing and self.countdown_active and self.chars_typed_this_cycle < target_chars:
-                        self.send_keypress_enhanced(' ')
-                        keypress_count += 1
-                        self.chars_typed_this_cycle += 1
-                
-                # Print progress every 50 characters
-                if self.chars_typed_this_cycle % 50 == 0 and self.chars_typed_this_cycle > 0:
-                    progress = (self.chars_typed_this_cycle / target_chars) * 100
-                    print(f"\n[PROGRESS] {self.chars_typed_this_cycle:,}/{target_chars:,} characters ({progress:.1f}%)")
-                
-                # Random delay between typing sessions
-                time.sleep(random.uniform(0.1, 0.5))
-                
-            except Exception as e:
-                print(f"Error typing: {e}")
-                break
+        # Without a fixed rate, pace the keys to finish just before the tracked chest deadline
+        controller = None
+        if self.typing_rate_control and not self.typing_chars_per_minute and target_chars:
+            controller = TypingRateController(plan, self.timer_tracker.remaining, self.typing_finish_margin)
+            left = self.timer_tracker.remaining()
+            if left is not None:
+                print(f"[PLAN] {target_chars:,} keys spread over {max(0.0, left - self.typing_finish_margin) / 60:.1f} minutes")
+        if controller is None:
+            print(f"[PLAN] {target_chars:,} keys over {plan['at'][-1] / 60 if target_chars else 0:.1f} minutes")
+        
+        def on_key(count):
+            self.chars_typed_this_cycle = count
+            # Print progress every 50 characters
+            if count % 50 == 0:
+                print(f"\n[PROGRESS] {count:,}/{target_chars:,} characters ({count / target_chars * 100:.1f}%)")
         
-        print(f"\n[FINAL] Characters typed this cycle: {self.chars_typed_this_cycle:,}/{target_chars:,}")
-        print(f"[FINAL] Total keypresses sent: {keypress_count}")
+        start = time.monotonic()
+        try:
+            # The orchestrator sets stop_typing whenever the countdown ends for any reason
+            self.typing.run(self.typing.plan_items(plan), stop=lambda: self.stop_typing, pace=controller,
+                            on_key=on_key)
+        except Exception as e:
+            print(f"Error typing: {e}")
+        
+        elapsed = time.monotonic() - start
+        rate = self.chars_typed_this_cycle / elapsed * 60 if elapsed > 0 else 0.0
+        print(f"\n[FINAL] Characters typed this cycle: {self.chars_typed_this_cycle:,}/{target_chars:,} ({rate:.0f}/min)")
+        if controller:
+            left = self.timer_tracker.remaining()
+            if left is not None:
+                print(f"[FINAL] Finished {left:.0f}s before the chest deadline, {controller.behind} keys ran late")
+        stats = self.keystrokes.stats()
+        print(f"[FINAL] Keys accepted by the system: {stats['sent']:,}, blocked: {stats['rejected']:,} ({stats['backend']})")
+        self.print_pattern_stats()
 
-    def type_random_words(self):
-        """Legacy method - kept for backward compatibility"""
+    def type_random_words(self, duration=None):
+        """Type from the endless pattern stream until typing is stopped, or for duration seconds"""
         keypress_count = 0
-        while not self.stop_typing and self.countdown_active:
-            try:
-                # Mix of different typing patterns for better detection
-                typing_pattern = random.choice(['word', 'chars', 'mixed', 'rapid'])
-                
-                if typing_pattern == 'word':
-                    # Type a full word with enhanced keypress
-                    word = self.get_random_words()
-                    for char in word:
-                        if self.stop_typing or not self.countdown_active:
-                            break
-                        self.send_keypress_enhanced(char)
-                        keypress_count += 1
-                        time.sleep(random.uniform(0.02, 0.08))  # Slightly longer delays
-                    
-                    # Add space
-                    if not self.stop_typing and self.countdown_active:
-                        self.send_keypress_enhanced(' ')
-                        keypress_count += 1
-                    
-                elif typing_pattern == 'chars':
-                    # Type individual characters more frequently
-                    for _ in range(random.randint(2, 5)):  # Reduced for better detection
-                        if self.stop_typing or not self.countdown_active:
-                            break
-                        char = self.get_random_chars()
-                        self.send_keypress_enhanced(char)
-                        keypress_count += 1
-                        time.sleep(random.uniform(0.02, 0.08))
-                    
-                    # Add space
-                    if not self.stop_typing and self.countdown_active:
-                        self.send_keypress_enhanced(' ')
-                        keypress_count += 1
-                
-                elif typing_pattern == 'rapid':
-                    # Rapid single character typing for maximum detection
-                    for _ in range(random.randint(1, 3)):
-                        if self.stop_typing or not self.countdown_active:
-                            break
-                        char = self.get_random_chars()
-                        # Try multiple methods for each character
-                        self.send_keypress_winapi(char)
-                        time.sleep(random.uniform(0.01, 0.03))
-                        self.send_keypress_pyautogui(char)
-                        keypress_count += 2  # Count both attempts
-                        time.sleep(random.uniform(0.02, 0.05))
-                
-                else:  # mixed
-                    # Mix of words and individual characters
-                    for _ in range(random.randint(1, 3)):  # Reduced for better detection
-                        if self.stop_typing or not self.countdown_active:
-                            break
-                        if random.choice([True, False]):
-                            # Type a word
-                            word = self.get_random_words()
-                            for char in word:
-                                if self.stop_typing or not self.countdown_active:
-                                    break
-                                self.send_keypress_enhanced(char)
-                                keypress_count += 1
-                                time.sleep(random.uniform(0.02, 0.08))
-                        else:
-                            # Type individual characters
-                            char = self.get_random_chars()
-                            self.send_keypress_enhanced(char)
-                            keypress_count += 1
-                            time.sleep(random.uniform(0.02, 0.08))
-                    
-                    # Add space
-                    if not self.stop_typing and self.countdown_active:
-                        self.send_keypress_enhanced(' ')
-                        keypress_count += 1
-                
-                # Print keypress count every 1000 keypresses
-                if keypress_count % 1000 == 0:
-                    print(f"\n[DEBUG] Total keypresses sent: {keypress_count}")
-                
-                # Random delay between typing sessions
-                time.sleep(random.uniform(0.1, 0.5))  # Longer delays for better detection
-                
-            except Exception as e:
-                print(f"Error typing: {e}")
-                break
+        
+        def on_key(count):
+            nonlocal keypress_count
+            keypress_count = count
+            if count % 1000 == 0:
+                print(f"\n[DEBUG] Total keypresses sent: {count}")
+        
+        deadline = time.monotonic() + duration if duration else None
+        hold = sum(self.keystrokes.hold_time) / 2
+        try:
+            self.typing.run(self.typing.stream(self.typing_seed, hold),
+                            stop=lambda: self.stop_typing or not self.countdown_active,
+                            deadline=deadline, on_key=on_key)
+        except Exception as e:
+            print(f"Error typing: {e}")
         
         print(f"\n[FINAL] Total keypresses sent: {keypress_count}")
+        self.print_pattern_stats()
+
+    def print_pattern_stats(self):
+        """Print how many keys each typing pattern produced in the last run, and how fast"""
+        for name, stats in self.typing.stats().items():
+            if stats['keys']:
+                print(f"[FINAL] {name}: {stats['keys']:,} keys ({stats['keys_per_minute']:.0f}/min)")
     
+    @on_detection_thread
     def find_bongo_cat_taskbar_icon(self):
         """Find and click the Bongo Cat app icon on the taskbar"""
         try:
             print("Looking for Bongo Cat taskbar icon...")
             
-            # Take a screenshot of the taskbar area
-            screenshot = pyautogui.screenshot()
+            # Capture the screen straight into memory (no PNG round-trip)
+            img = self.capture_frame()
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            taskbar_screenshot_path = os.path.join(self.screenshot_dir, f"taskbar_search_{timestamp}.png")
-            screenshot.save(taskbar_screenshot_path)
-            
-            # Load the screenshot and taskbar icon template
-            img = cv2.imread(taskbar_screenshot_path)
-            if img is None:
-                print("Failed to load taskbar screenshot")
-                return False
-            
-            # Load Bongo Cat taskbar icon template
-            icon_template_path = "App_icon_on_task_bar.png"
-            if not os.path.exists(icon_template_path):
-                print(f"Bongo Cat taskbar icon template not found at {icon_template_path}")
-                return False
-            
-            template = cv2.imread(icon_template_path)
-            if template is None:
-                print("Failed to load taskbar icon template")
-                return False
+            self.save_debug_frame(img, "taskbar_search", timestamp)
             
             print(f"📏 Screenshot dimensions: {img.shape[1]}x{img.shape[0]}")
-            print(f"📏 Icon template dimensions: {template.shape[1]}x{template.shape[0]}")
-            
-            # Convert both images to grayscale for template matching
-            img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-            
-            # Get template dimensions
-            template_h, template_w = template_gray.shape
-            
             print(f"🔍 Starting taskbar icon template matching...")
             
-            # Perform template matching
-            result = cv2.matchTemplate(img_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-            
-            # Find the best match location
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            # Coarse-to-fine match against the cached icon template
+            match = self.matcher.match('taskbar_icon', img)
+            if match is None:
+                print("Failed to load taskbar icon template")
+                return False
             
+            max_val = match['confidence']
+            threshold = match['threshold']
             print(f"🎯 Best match confidence: {max_val:.4f}")
             
-            # Set threshold for matching
-            threshold = 0.7
-            
-            if max_val >= threshold:
-                # Get the top-left corner of the matched area
-                top_left = max_loc
-                bottom_right = (top_left[0] + template_w, top_left[1] + template_h)
-                
-                # Calculate center point for clicking
-                center_x = top_left[0] + template_w // 2
-                center_y = top_left[1] + template_h // 2
+            if match['found']:
+                top_left = match['top_left']
+                bottom_right = match['bottom_right']
+                center_x, center_y = match['center']
                 
                 print(f"🎯 Bongo Cat taskbar icon found! Confidence: {max_val:.4f}")
                 print(f"📍 Icon location: top_left=({top_left[0]}, {top_left[1]}), bottom_right=({bottom_right[0]}, {bottom_right[1]})")
                 print(f"🖱️ Clicking on taskbar icon at position ({center_x}, {center_y})")
                 
-                # Move mouse and click
-                pyautogui.moveTo(center_x, center_y, duration=0.5)
-                time.sleep(0.2)
-                pyautogui.click()
-                time.sleep(0.5)  # Wait for Bongo Cat to become active
+                # Move mouse and click, then wait for Bongo Cat to become active
+                self.click_at(center_x, center_y, clicks=1, settle=0.5)
                 
                 print("✅ Bongo Cat taskbar icon clicked!")
                 
-                # Draw rectangle around the found icon for verification
-                cv2.rectangle(img, top_left, bottom_right, (0, 255, 0), 2)
-                cv2.putText(img, f"Bongo Cat Icon (Conf: {max_val:.3f})", 
-                           (top_left[0], top_left[1] - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                
-                # Save verification screenshot
-                verification_path = os.path.join(self.screenshot_dir, f"taskbar_icon_found_{timestamp}.png")
-                cv2.imwrite(verification_path, img)
-                print(f"✅ Screenshot with detected taskbar icon saved as {verification_path}")
-                
-                # Clean up old screenshots to keep only 10 most recent
-                self.cleanup_old_screenshots()
+                # Save verification screenshot (annotated and encoded off the click path)
+                verification_path = self.save_debug_frame(
+                    img, "taskbar_icon_found", timestamp, confidence=max_val,
+                    box=(top_left, bottom_right), label=f"Bongo Cat Icon (Conf: {max_val:.3f})")
+                if verification_path:
+                    print(f"✅ Screenshot with detected taskbar icon queued as {verification_path}")
                 return True
             else:
                 print(f"❌ Bongo Cat taskbar icon not found. Best match confidence: {max_val:.4f} (threshold: {threshold})")
                 print("💡 Try adjusting the threshold or check if the icon is visible in the screenshot")
                 
                 # Still save the screenshot for manual inspection
-                verification_path = os.path.join(self.screenshot_dir, f"taskbar_icon_not_found_{timestamp}.png")
-                cv2.imwrite(verification_path, img)
-                print(f"📸 Screenshot saved for inspection: {verification_path}")
+                verification_path = self.save_debug_frame(img, "taskbar_icon_not_found", timestamp, confidence=max_val)
+                if verification_path:
+                    print(f"📸 Screenshot queued for inspection: {verification_path}")
                 return False
                 
         except Exception as e:
@@ -772,40 +2728,21 @@ class SteamGameMonitor:
         print("Press Ctrl+C to stop the program.")
         
         self.countdown_active = True
-        self.stop_typing = False
-        
-        # Start typing thread with character target
-        self.typing_thread = threading.Thread(target=self.type_random_words_with_target, args=(target_chars,))
-        self.typing_thread.daemon = True
-        self.typing_thread.start()
         
-        # Smart countdown using OCR timer
-        for remaining in range(countdown_duration, 0, -1):
-            if not self.countdown_active:
-                break
-                
-            minutes = remaining // 60
-            seconds = remaining % 60
-            print(f"\rCycle {cycle_number} - Time remaining: {minutes:02d}:{seconds:02d}", end="", flush=True)
-            time.sleep(1)
+        # Type, follow the game timer and open the chest as one cycle of cooperative tasks
+        result = self.orchestrator.run(cycle_number, countdown_duration, target_chars)
+        if result['outcome'] == 'game_stopped':
+            self.is_game_running = False
+        if result['outcome'] != 'expired':
+            self.countdown_active = False
+            return 0
         
-        if self.countdown_active:
-            print(f"\n\nCycle {cycle_number} completed! Taking screenshot and opening chest...")
-            self.stop_typing = True
-            
-            # Clean up the typing area
-            self.cleanup_typing_area()
-            
-            # Take screenshot and find chest
-            chest_found = self.take_screenshot_and_find_chest()
-            if not chest_found:
-                print("🛑 Program stopped due to chest detection failure.")
-                return 0
-            
-            # Return characters typed this cycle
-            return getattr(self, 'chars_typed_this_cycle', 0)
+        if not result['chest_found']:
+            print("🛑 Program stopped due to chest detection failure.")
+            return 0
         
-        return 0
+        # Return characters typed this cycle
+        return getattr(self, 'chars_typed_this_cycle', 0)
 
     def start_countdown_chest_only(self, cycle_number):
         """Start countdown without typing for Operation 2"""
@@ -827,26 +2764,19 @@ class SteamGameMonitor:
         
         self.countdown_active = True
         
-        # No typing thread - just wait
-        for remaining in range(countdown_duration, 0, -1):
-            if not self.countdown_active:
-                break
-                
-            minutes = remaining // 60
-            seconds = remaining % 60
-            print(f"\rCycle {cycle_number} - Time remaining: {minutes:02d}:{seconds:02d}", end="", flush=True)
-            time.sleep(1)
+        # No typing - just follow the game timer, then find the chest and keep watching for it
+        result = self.orchestrator.run(cycle_number, countdown_duration)
+        if result['outcome'] == 'game_stopped':
+            self.is_game_running = False
+        if result['outcome'] != 'expired':
+            self.countdown_active = False
+            return
         
-        if self.countdown_active:
-            print(f"\n\nCycle {cycle_number} completed! Taking screenshot and opening chest...")
-            
-            # Take screenshot and find chest with retry mechanism
-            chest_found = self.take_screenshot_and_find_chest()
-            if not chest_found:
-                print("🛑 Program stopped due to chest detection failure after 6 attempts.")
-                # Set a flag to indicate program should stop
-                self.countdown_active = False
-                return
+        if not result['chest_found']:
+            print("🛑 Program stopped due to chest detection failure.")
+            # Set a flag to indicate program should stop
+            self.countdown_active = False
+            return
 
     def start_countdown(self, cycle_number=None):
         """Legacy method - kept for backward compatibility"""
@@ -855,168 +2785,155 @@ class SteamGameMonitor:
         else:
             self.start_countdown_chest_only(1)
     
-    def take_screenshot_and_find_chest(self, attempt=1, max_attempts=7):
-        """Take screenshot and find bongo cat chest icon using template matching with retry mechanism"""
+    def get_chest_search_regions(self, frame_width, frame_height, template, full_screen=True):
+        """Get chest search regions (x0, y0, x1, y1), most likely first: hot spot, game window, full screen"""
+        if not self.bongo_cat_window:
+            self.find_bongo_cat_window()
+        return chest_search_regions(frame_width, frame_height, template,
+                                    self.chest_hot_spot, self.chest_hot_spot_margin,
+                                    self.bongo_cat_window, self.chest_window_margin, full_screen)
+    
+    def click_at(self, x, y, clicks=1, settle=0.0):
+        """Move the mouse to (x, y) and click; in dry-run mode the click is only logged"""
+        if self.dry_run:
+            print(f"🧪 Dry run: would click {clicks}x at ({x}, {y})")
+            return
+        pyautogui.moveTo(x, y, duration=0.5)
+        time.sleep(0.2)
+        for click in range(clicks):
+            if click:
+                time.sleep(0.2)
+            pyautogui.click()
+        if settle:
+            time.sleep(settle)
+    
+    def find_chest(self, img):
+        """Find the chest in a full-screen frame, searching the most likely regions first"""
+        # Chest template (decoded once, kept in grayscale)
+        template = self.templates.get('chest')
+        if template is None:
+            print("❌ Failed to load chest template image")
+            return None
+        
+        print(f"📏 Template dimensions: {template.width}x{template.height}")
+        print(f"🔍 Starting template matching...")
+        
+        # Search the last chest location first, then the game window, then every monitor
+        match = None
+        for region_name, region in self.get_chest_search_regions(img.shape[1], img.shape[0], template,
+                                                                 full_screen=False):
+            region_match = self.matcher.match('chest', img, roi=region)
+            if region_match is None:
+                continue
+            x0, y0, x1, y1 = region
+            print(f"🔎 {region_name}: ({x0}, {y0})-({x1}, {y1}) confidence {region_match['confidence']:.4f}")
+            
+            # Keep the best match so far
+            if match is None or region_match['confidence'] > match['confidence']:
+                match = region_match
+            if match['found']:
+                break
+        if match and match['found']:
+            return match
+
+        # Full screen fallback: the whole virtual desktop where the backend can capture it (large
+        # multi-monitor desktops are where tiled matching pays off), else the primary monitor frame
+        desktop, offset = self.capture.capture_desktop(img)
+        desktop_match = self.matcher.match('chest', desktop, offset=offset)
+        if desktop_match:
+            print(f"🔎 Full screen: {desktop.shape[1]}x{desktop.shape[0]} at ({offset[0]}, {offset[1]}) "
+                  f"confidence {desktop_match['confidence']:.4f}")
+            if match is None or desktop_match['confidence'] > match['confidence']:
+                match = desktop_match
+        return match
+    
+    def click_chest(self, match, img=None, timestamp=None):
+        """Click a found chest and remember its location as the next search hot spot"""
+        top_left = match['top_left']
+        bottom_right = match['bottom_right']
+        center_x, center_y = match['center']
+        max_val = match['confidence']
+        
+        # Remember where the chest was so the next search starts there
+        self.chest_hot_spot = (top_left[0], top_left[1], match['width'], match['height'])
+        
+        print(f"🎁 Chest found! Confidence: {max_val:.4f}")
+        print(f"📍 Chest location: top_left=({top_left[0]}, {top_left[1]}), bottom_right=({bottom_right[0]}, {bottom_right[1]})")
+        print(f"🖱️ Clicking on chest at position ({center_x}, {center_y})")
+        
+        # Move mouse and double click for better reliability
+        self.click_at(center_x, center_y, clicks=2)
+        
+        print("✅ Chest clicked!")
+        
+        # Save verification screenshot (annotated and encoded off the click path)
+        if img is not None:
+            verification_path = self.save_debug_frame(
+                img, "chest_found", timestamp, confidence=max_val,
+                box=(top_left, bottom_right), label=f"Chest (Conf: {max_val:.3f})")
+            if verification_path:
+                print(f"✅ Screenshot with detected chest queued as {verification_path}")
+    
+    @on_detection_thread
+    def take_screenshot_and_find_chest(self, watch_timeout=None):
+        """Take screenshot and find bongo cat chest icon, then watch the chest region until it appears"""
         try:
             print("📸 Taking screenshot for chest detection...")
             
-            # Take screenshot
-            screenshot = pyautogui.screenshot()
+            # Capture the screen straight into memory (no PNG round-trip)
+            img = self.capture_frame()
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = os.path.join(self.screenshot_dir, f"chest_search_{timestamp}.png")
-            screenshot.save(screenshot_path)
-            print(f"Screenshot saved as {screenshot_path}")
-            
-            # Load the screenshot and chest template
-            img = cv2.imread(screenshot_path)
-            if img is None:
-                print("❌ Failed to load screenshot")
-                return
+            screenshot_path = self.save_debug_frame(img, "chest_search", timestamp)
+            if screenshot_path:
+                print(f"Screenshot queued as {screenshot_path}")
             
             print(f"📏 Screenshot dimensions: {img.shape[1]}x{img.shape[0]}")
             
-            # Load chest template
-            chest_template_path = "chest.png"
-            if not os.path.exists(chest_template_path):
-                print(f"❌ Chest template image not found at {chest_template_path}")
-                return
-            
-            template = cv2.imread(chest_template_path)
-            if template is None:
-                print("❌ Failed to load chest template image")
-                return
-            
-            print(f"📏 Template dimensions: {template.shape[1]}x{template.shape[0]}")
-            
-            # Convert both images to grayscale for template matching
-            img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+            match = self.find_chest(img)
+            max_val = match['confidence'] if match else -1.0
+            threshold = self.matcher.thresholds['chest']
+            print(f"🎯 Best match confidence: {max_val:.4f}")
             
-            # Get template dimensions
-            template_h, template_w = template_gray.shape
+            if match and match['found']:
+                self.click_chest(match, img, timestamp)
+                return True
             
-            print(f"🔍 Starting template matching...")
+            print(f"❌ No chest found. Best match confidence: {max_val:.4f} (threshold: {threshold})")
+            print("💡 Try adjusting the threshold or check if the chest image is visible in the screenshot")
             
-            # Perform template matching
-            result = cv2.matchTemplate(img_gray, template_gray, cv2.TM_CCOEFF_NORMED)
+            # Still save the screenshot for manual inspection
+            verification_path = self.save_debug_frame(img, "chest_not_found", timestamp, confidence=max_val)
+            if verification_path:
+                print(f"📸 Screenshot queued for inspection: {verification_path}")
+                print("🔍 Please check the screenshot to see if the chest is visible and adjust the template image if needed")
             
-            # Find the best match location
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            # Keep watching the chest region and click as soon as the chest appears
+            if watch_timeout is None:
+                watch_timeout = self.chest_watch_timeout
+            print(f"\n⚠️ CHEST NOT FOUND YET")
+            print("🔄 Possible reasons:")
+            print("1. Game timer hasn't reached 30 minutes yet")
+            print("2. Chest template image needs updating") 
+            print("3. Chest is in a different location")
+            print(f"\n👀 Watching the chest region for up to {watch_timeout // 60} minutes...")
             
-            print(f"🎯 Best match confidence: {max_val:.4f}")
+            match = self.chest_watcher.watch(watch_timeout, self.stop_event)
+            if match:
+                self.click_chest(match)
+                return True
             
-            # Set threshold for matching (start with lower threshold)
-            threshold = 0.5  # Lowered from 0.7
+            if self.stop_event.is_set():
+                print("⏹️ Chest watch cancelled.")
+                return False
             
-            if max_val >= threshold:
-                # Get the top-left corner of the matched area
-                top_left = max_loc
-                bottom_right = (top_left[0] + template_w, top_left[1] + template_h)
-                
-                # Calculate center point for clicking
-                center_x = top_left[0] + template_w // 2
-                center_y = top_left[1] + template_h // 2
-                
-                print(f"🎁 Chest found! Confidence: {max_val:.4f}")
-                print(f"📍 Chest location: top_left=({top_left[0]}, {top_left[1]}), bottom_right=({bottom_right[0]}, {bottom_right[1]})")
-                print(f"🖱️ Clicking on chest at position ({center_x}, {center_y})")
-                
-                # Move mouse and click
-                pyautogui.moveTo(center_x, center_y, duration=0.5)
-                time.sleep(0.2)
-                pyautogui.click()
-                time.sleep(0.2)
-                pyautogui.click()  # Double click for better reliability
-                
-                print("✅ Chest clicked!")
-                
-                # Draw rectangle around the found chest for verification
-                cv2.rectangle(img, top_left, bottom_right, (0, 255, 0), 2)
-                cv2.putText(img, f"Chest (Conf: {max_val:.3f})", 
-                           (top_left[0], top_left[1] - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                
-                # Save verification screenshot
-                verification_path = os.path.join(self.screenshot_dir, f"chest_found_{timestamp}.png")
-                cv2.imwrite(verification_path, img)
-                print(f"✅ Screenshot with detected chest saved as {verification_path}")
-                
-                # Clean up old screenshots to keep only 10 most recent
-                self.cleanup_old_screenshots()
-                return True
-                
-            else:
-                print(f"❌ No chest found. Best match confidence: {max_val:.4f} (threshold: {threshold})")
-                print("💡 Try adjusting the threshold or check if the chest image is visible in the screenshot")
-                
-                # Try with even lower threshold
-                lower_threshold = 0.3
-                if max_val >= lower_threshold:
-                    print(f"🔍 Trying with lower threshold {lower_threshold}...")
-                    top_left = max_loc
-                    bottom_right = (top_left[0] + template_w, top_left[1] + template_h)
-                    center_x = top_left[0] + template_w // 2
-                    center_y = top_left[1] + template_h // 2
-                    
-                    print(f"🎁 Chest found with lower threshold! Confidence: {max_val:.4f}")
-                    print(f"🖱️ Clicking on chest at position ({center_x}, {center_y})")
-                    
-                    pyautogui.moveTo(center_x, center_y, duration=0.5)
-                    time.sleep(0.2)
-                    pyautogui.click()
-                    time.sleep(0.2)
-                    pyautogui.click()
-                    
-                    print("✅ Chest clicked with lower threshold!")
-                    
-                    # Draw rectangle around the found chest for verification
-                    cv2.rectangle(img, top_left, bottom_right, (0, 255, 0), 2)
-                    cv2.putText(img, f"Chest (Conf: {max_val:.3f})", 
-                               (top_left[0], top_left[1] - 10), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                    
-                    # Save verification screenshot
-                    verification_path = os.path.join(self.screenshot_dir, f"chest_found_low_thresh_{timestamp}.png")
-                    cv2.imwrite(verification_path, img)
-                    print(f"✅ Screenshot with detected chest saved as {verification_path}")
-                    
-                    # Clean up old screenshots to keep only 10 most recent
-                    self.cleanup_old_screenshots()
-                    return True
-                else:
-                    # Still save the screenshot for manual inspection
-                    verification_path = os.path.join(self.screenshot_dir, f"chest_not_found_{timestamp}.png")
-                    cv2.imwrite(verification_path, img)
-                    print(f"📸 Screenshot saved for inspection: {verification_path}")
-                    print("🔍 Please check the screenshot to see if the chest is visible and adjust the template image if needed")
-                    
-                    # Handle chest not found with retry mechanism
-                    if attempt < max_attempts:
-                        print(f"\n⚠️ CHEST NOT FOUND - Attempt {attempt}/{max_attempts}")
-                        print("🔄 Possible reasons:")
-                        print("1. Game timer hasn't reached 30 minutes yet")
-                        print("2. Chest template image needs updating") 
-                        print("3. Chest is in a different location")
-                        print(f"\n⏰ Waiting 5 minutes before retry {attempt + 1}/{max_attempts}...")
-                        
-                        # Wait 5 minutes (300 seconds)
-                        for remaining in range(300, 0, -1):
-                            minutes = remaining // 60
-                            seconds = remaining % 60
-                            print(f"\r⏰ Waiting: {minutes:02d}:{seconds:02d} remaining", end="", flush=True)
-                            time.sleep(1)
-                        
-                        print(f"\n🔄 Retrying chest detection (Attempt {attempt + 1}/{max_attempts})...")
-                        return self.take_screenshot_and_find_chest(attempt + 1, max_attempts)
-                    else:
-                        print(f"\n❌ CHEST NOT FOUND after {max_attempts} attempts!")
-                        print("🛑 Stopping program due to repeated chest detection failures.")
-                        print("💡 Possible solutions:")
-                        print("1. Check if Bongo Cat game is running properly")
-                        print("2. Update chest template image (chest.png)")
-                        print("3. Verify game timer synchronization")
-                        print("4. Check if chest spawns in different location")
-                        return False
+            print(f"\n❌ CHEST NOT FOUND after watching for {watch_timeout // 60} minutes!")
+            print("🛑 Stopping program due to repeated chest detection failures.")
+            print("💡 Possible solutions:")
+            print("1. Check if Bongo Cat game is running properly")
+            print("2. Update chest template image (chest.png)")
+            print("3. Verify game timer synchronization")
+            print("4. Check if chest spawns in different location")
+            return False
                 
         except Exception as e:
             print(f"❌ Error during screenshot and detection: {e}")
@@ -1049,6 +2966,8 @@ class SteamGameMonitor:
                     
                     self.is_game_running = True
                     chars_typed = self.start_countdown_with_typing(cycle_count, chars_this_cycle)
+                    if not self.is_game_running:  # Bongo Cat closed mid-countdown; wait for it to come back
+                        continue
                     if chars_typed == 0:  # Program stopped due to chest detection failure
                         print("🛑 Program stopped due to chest detection failure.")
                         break
@@ -1062,7 +2981,7 @@ class SteamGameMonitor:
                     if cycle_count < max_cycles and total_chars_typed < target_chars:
                         print(f"\n⏳ Cycle {cycle_count} completed. Total typed: {total_chars_typed:,}/{target_chars:,}")
                         print("Press Ctrl+C to stop, or wait for next cycle...")
-                        time.sleep(5)  # Brief pause between cycles
+                        self.stop_event.wait(5)  # Brief pause between cycles
                     
                 elif not is_running and self.is_game_running:
                     print("\n❌ Bongo Cat stopped during cycle.")
@@ -1070,7 +2989,8 @@ class SteamGameMonitor:
                     self.countdown_active = False
                     self.stop_typing = True
                 
-                time.sleep(2)  # Check every 2 seconds
+                if self.stop_event.wait(2):  # Check every 2 seconds
+                    break
             
             if total_chars_typed >= target_chars:
                 print(f"\n🎉 TARGET ACHIEVED! Typed {total_chars_typed:,} characters in {cycle_count} cycles!")
@@ -1081,10 +3001,9 @@ class SteamGameMonitor:
         except KeyboardInterrupt:
             print(f"\n\n⏹️ Program stopped by user after {cycle_count} cycles")
             print(f"📊 Total characters typed: {total_chars_typed:,}/{target_chars:,}")
+            self.stop_event.set()
             self.countdown_active = False
             self.stop_typing = True
-            if self.typing_thread:
-                self.typing_thread.join(timeout=1)
 
     def run_chest_only_mode(self):
         """Operation 2: Chest-only mode - clicks chest every 30 minutes without typing"""
@@ -1105,6 +3024,8 @@ class SteamGameMonitor:
                     
                     self.is_game_running = True
                     self.start_countdown_chest_only(cycle_count)
+                    if not self.is_game_running:  # Bongo Cat closed mid-countdown; wait for it to come back
+                        continue
                     
                     # Check if program stopped due to chest detection failure
                     if not self.countdown_active:
@@ -1117,17 +3038,19 @@ class SteamGameMonitor:
                     
                     print(f"\n⏳ Cycle {cycle_count} completed. Waiting for next 30-minute cycle...")
                     print("Press Ctrl+C to stop, or wait for next cycle...")
-                    time.sleep(5)  # Brief pause between cycles
+                    self.stop_event.wait(5)  # Brief pause between cycles
                     
                 elif not is_running and self.is_game_running:
                     print("\n❌ Bongo Cat stopped during cycle.")
                     self.is_game_running = False
                     self.countdown_active = False
                 
-                time.sleep(2)  # Check every 2 seconds
+                if self.stop_event.wait(2):  # Check every 2 seconds
+                    break
                 
         except KeyboardInterrupt:
             print(f"\n\n⏹️ Program stopped by user after {cycle_count} cycles")
+            self.stop_event.set()
             self.countdown_active = False
 
     def run(self):
@@ -1152,6 +3075,10 @@ def display_menu():
     print("   - No typing involved")
     print("   - Perfect for passive monitoring")
     print()
+    print("3. 🐱 MULTI-INSTANCE CHEST MODE")
+    print("   - Clicks chests for every running Bongo Cat window")
+    print("   - One screen capture and process scan shared by all games")
+    print()
     print("="*60)
     print("Your choice: ", end="")
 
@@ -1160,10 +3087,10 @@ def get_user_choice():
     while True:
         try:
             choice = input().strip()
-            if choice in ['1', '2']:
+            if choice in ['1', '2', '3']:
                 return int(choice)
             else:
-                print("❌ Invalid choice. Please enter 1 or 2.")
+                print("❌ Invalid choice. Please enter 1, 2 or 3.")
                 print("Your choice: ", end="")
         except KeyboardInterrupt:
             print("\n\n👋 Program cancelled by user.")
@@ -1224,7 +3151,8 @@ def main():
     # Disable pyautogui failsafe for continuous typing
     pyautogui.FAILSAFE = True  # Keep failsafe enabled for safety
     
-    monitor = SteamGameMonitor()
+    # Set save_debug_screenshots=True to keep annotated detection frames in ./screenshot
+    monitor = SteamGameMonitor(save_debug_screenshots=False)
     
     # Check if Bongo Cat is running
     print("🔍 Checking for Bongo Cat game...")
@@ -1259,12 +3187,21 @@ def main():
         print(f"\n🚀 Starting TYPING MODE with {cycles} cycles...")
         print("Press Ctrl+C to stop the program at any time.")
         monitor.run_typing_mode(cycles)
+        monitor.shutdown()
         
     elif choice == 2:
         # Operation 2: Chest-Only Mode
         print(f"\n🚀 Starting CHEST-ONLY MODE...")
         print("Press Ctrl+C to stop the program at any time.")
         monitor.run_chest_only_mode()
+        monitor.shutdown()
+        
+    elif choice == 3:
+        # Operation 3: Chest-only mode for several games at once
+        print(f"\n🚀 Starting MULTI-INSTANCE CHEST MODE...")
+        print("Press Ctrl+C to stop the program at any time.")
+        monitor.instance_manager.run()
+        monitor.shutdown()
 
 def test_process_detection():
     """Test function to help identify Bongo Cat process"""